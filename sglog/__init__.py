@@ -0,0 +1,7 @@
+"""Strokes Gained Log core library.
+
+Everything in this package is importable without Streamlit so rounds can be
+scored from scripts and batch jobs as well as from ``streamlit_app.py``.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,5 @@
+import sys
+
+from sglog.cli import main
+
+sys.exit(main())
@@ -0,0 +1,181 @@
+"""Expected-strokes baseline lookup table.
+
+The baseline is precomputed once into a dense ``(lie, distance)`` array with
+one cell per yard (per foot on the green) from 0 to ``MAX_DISTANCE``, so
+looking up a shot is a single indexed read plus a linear blend with the next
+cell. The default table is built once per process and shared read-only by
+every session.
+
+Baselines fitted from our own archive (``sglog.fit``) are saved as versioned
+JSON files of anchors, one set per segment (round type), and loaded with
+``load_baseline``; the app uses the file named by ``SGLOG_BASELINE``.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from sglog.cache import reference
+
+# Fitted baseline file used by the app instead of the tour baseline, if set
+BASELINE_PATH = os.environ.get("SGLOG_BASELINE", "")
+
+# Segment of a fitted baseline file fitted on every round type together
+ALL_SEGMENT = "all"
+
+# Lie options from the Step 3 ``Lie`` selectbox, in table row order
+LIES = ("Tee", "Fairway", "Rough", "Sand", "Green", "Other")
+
+# Largest distance the ``Pin Distance`` input accepts
+MAX_DISTANCE = 1000
+
+# Expected strokes to hole out (tour average), as (distance, strokes) anchors
+# per lie. Values between anchors are interpolated, values outside are clamped.
+BASELINE_ANCHORS = {
+    "Tee": (
+        [100, 120, 140, 160, 180, 200, 220, 240, 260, 280, 300,
+         320, 340, 360, 380, 400, 420, 440, 460, 480, 500, 520, 540, 560, 580, 600],
+        [2.92, 2.95, 2.97, 2.99, 3.05, 3.12, 3.17, 3.25, 3.45, 3.65, 3.71,
+         3.79, 3.86, 3.92, 3.96, 3.99, 4.02, 4.08, 4.17, 4.28, 4.41, 4.54, 4.65, 4.74, 4.79, 4.82],
+    ),
+    "Fairway": (
+        [0, 10, 20, 40, 60, 80, 100, 120, 140, 160, 180, 200,
+         220, 240, 260, 280, 300, 350, 400, 450, 500, 550, 600],
+        [1.00, 2.18, 2.40, 2.60, 2.70, 2.75, 2.80, 2.85, 2.91, 2.98, 3.08, 3.19,
+         3.32, 3.45, 3.58, 3.69, 3.78, 3.97, 4.11, 4.24, 4.41, 4.56, 4.70],
+    ),
+    "Rough": (
+        [0, 10, 20, 40, 60, 80, 100, 120, 140, 160, 180, 200,
+         220, 240, 260, 280, 300, 350, 400, 450, 500, 550, 600],
+        [1.00, 2.34, 2.59, 2.78, 2.91, 2.96, 3.02, 3.08, 3.15, 3.23, 3.31, 3.42,
+         3.53, 3.64, 3.74, 3.83, 3.90, 4.05, 4.21, 4.38, 4.55, 4.70, 4.85],
+    ),
+    "Sand": (
+        [0, 10, 20, 40, 60, 80, 100, 120, 140, 160, 180, 200,
+         220, 240, 260, 280, 300, 350, 400],
+        [1.00, 2.43, 2.53, 2.82, 3.15, 3.24, 3.23, 3.21, 3.22, 3.28, 3.40, 3.55,
+         3.70, 3.84, 3.93, 4.00, 4.04, 4.20, 4.35],
+    ),
+    # Green distances are in feet
+    "Green": (
+        [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 15, 20, 30, 40, 50, 60, 90, 120],
+        [0.00, 1.00, 1.01, 1.04, 1.13, 1.23, 1.34, 1.42, 1.50, 1.56, 1.61,
+         1.78, 1.87, 1.98, 2.06, 2.14, 2.21, 2.40, 2.55],
+    ),
+    # Recovery shots (trees, hazards, bad lies)
+    "Other": (
+        [0, 20, 50, 100, 150, 200, 250, 300, 400, 500, 600],
+        [1.00, 3.00, 3.40, 3.80, 3.80, 3.87, 4.07, 4.23, 4.50, 4.75, 5.00],
+    ),
+}
+
+
+class BaselineTable:
+    """Dense expected-strokes table indexed by lie code and distance.
+
+    Row ``len(lies)`` is all ``NaN`` and is used for unknown lies and missing
+    distances, so invalid shots need no special casing in the lookup.
+    """
+
+    __slots__ = ("lies", "max_distance", "version", "_codes", "_width", "_flat")
+
+    def __init__(self, lies, values, version="default"):
+        values = np.asarray(values, dtype=float)
+        if values.shape[0] != len(lies):
+            raise ValueError(f"Expected {len(lies)} baseline rows, got {values.shape[0]}")
+
+        self.lies = tuple(lies)
+        self.max_distance = values.shape[1] - 1
+        self.version = version
+        self._codes = {lie: code for code, lie in enumerate(self.lies)}
+
+        # One spare column so the upper blend cell always exists, and a spare
+        # NaN row for invalid shots
+        self._width = values.shape[1] + 1
+        table = np.full((len(self.lies) + 1, self._width), np.nan)
+        table[:-1, :-1] = values
+        table[:-1, -1] = values[:, -1]
+        table.flags.writeable = False
+        self._flat = table.ravel()
+
+    @classmethod
+    def from_anchors(cls, anchors, max_distance=MAX_DISTANCE, version="default"):
+        """Precompute a table by interpolating ``{lie: (distances, strokes)}``."""
+        grid = np.arange(max_distance + 1, dtype=float)
+        lies = tuple(anchors)
+        values = np.vstack([np.interp(grid, *anchors[lie]) for lie in lies])
+        return cls(lies, values, version=version)
+
+    @property
+    def table(self):
+        """Read-only ``(lie, distance)`` view of the precomputed values."""
+        return self._flat.reshape(-1, self._width)[:-1, :-1]
+
+    def lie_codes(self, lies):
+        """Map an array of lie names to table row codes (unknown -> NaN row)."""
+        lies = np.asarray(lies, dtype=object)
+        codes = np.full(lies.shape, len(self.lies), dtype=np.intp)
+        for lie, code in self._codes.items():
+            codes[lies == lie] = code
+        return codes
+
+    def lookup(self, codes, distances, out=None):
+        """Expected strokes for arrays of lie codes and distances.
+
+        Distances are clamped to the table range and blended linearly between
+        whole-unit cells; negative or missing distances give ``NaN``. Pass
+        ``out`` to reuse a result buffer across calls.
+        """
+        distances = np.asarray(distances, dtype=float)
+        codes = np.where(distances >= 0, codes, len(self.lies))
+        if out is None:
+            out = np.empty(distances.shape)
+
+        pos = np.clip(np.nan_to_num(distances, nan=0.0), 0.0, self.max_distance)
+        cell = pos.astype(np.intp)
+        flat = codes * self._width + cell
+        lower = self._flat.take(flat)
+        upper = self._flat.take(flat + 1)
+
+        np.subtract(pos, cell, out=pos)
+        np.subtract(upper, lower, out=upper)
+        np.multiply(upper, pos, out=upper)
+        np.add(lower, upper, out=out)
+        return out
+
+    def expected(self, lie, distance):
+        """Expected strokes for a single shot, without array overhead."""
+        code = self._codes.get(lie)
+        if code is None or distance is None or not distance >= 0:
+            return float("nan")
+        pos = min(float(distance), self.max_distance)
+        cell = int(pos)
+        lower = self._flat[code * self._width + cell]
+        upper = self._flat[code * self._width + cell + 1]
+        return float(lower + (upper - lower) * (pos - cell))
+
+    def expected_strokes(self, lies, distances, out=None):
+        """Expected strokes for arrays of lie names and distances."""
+        return self.lookup(self.lie_codes(lies), distances, out=out)
+
+
+def default_baseline():
+    """Process-wide tour baseline, built on first use."""
+    return reference("baseline/tour", lambda: BaselineTable.from_anchors(BASELINE_ANCHORS))
+
+
+def load_baseline(path, segment=None):
+    """Table for ``segment`` (e.g. a round type) of a fitted baseline file.
+
+    Falls back to the file's ``ALL_SEGMENT`` fit when ``segment`` is ``None``
+    or was not fitted. The table's ``version`` is ``<file version>/<segment>``.
+    """
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    segments = doc["segments"]
+    if segment not in segments:
+        segment = ALL_SEGMENT
+    anchors = {lie: (fit["distances"], fit["strokes"])
+               for lie, fit in segments[segment]["lies"].items()}
+    return BaselineTable.from_anchors(anchors, version=f"{doc['version']}/{segment}")
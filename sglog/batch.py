@@ -0,0 +1,130 @@
+"""Season-archive batch processing.
+
+Loads a directory of ``<Player>_Stroke_Trail.csv`` exports across a process
+pool, merges them into one validated table and rolls strokes gained up per
+round, per player and per tournament.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from sglog.core import ROUND_COLUMNS
+from sglog.stroke_trail import COLUMN_DTYPES, StrokeTrailError, check_columns
+
+TRAIL_PATTERN = "*_Stroke_Trail.csv"
+
+# Rows per chunk when parsing a single file
+DEFAULT_CHUNKSIZE = 5000
+
+# Columns every row needs to be usable
+REQUIRED_COLUMNS = ["Player", "RndDate", "Round", "Hole", "Par"]
+
+
+def find_trail_files(directory, pattern=TRAIL_PATTERN):
+    """Sorted stroke-trail CSV paths under ``directory`` (recursive)."""
+    return sorted(Path(directory).rglob(pattern))
+
+
+def load_trail_file(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Parse one stroke-trail CSV chunk by chunk.
+
+    Returns ``(table, errors)`` where rows missing a required column are
+    dropped from ``table`` and reported in ``errors``. Chunking bounds the
+    parser's buffers only: the kept rows of the whole file are returned as
+    one table. Column types are left as parsed; ``load_archive`` applies
+    ``COLUMN_DTYPES`` once after merging, which is much cheaper than
+    converting every small file.
+    """
+    chunks = []
+    errors = []
+    reader = pd.read_csv(path, keep_default_na=False, na_values=[""], chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            check_columns(chunk.columns, source=str(path))
+            bad = chunk[REQUIRED_COLUMNS].isna().any(axis=1)
+            if bad.any():
+                errors.append(f"{path}: {int(bad.sum())} rows missing {', '.join(REQUIRED_COLUMNS)}")
+                chunk = chunk[~bad]
+            chunks.append(chunk)
+
+    table = pd.concat(chunks, ignore_index=True) if chunks else None
+    return table, errors
+
+
+def _load_worker(args):
+    path, chunksize = args
+    try:
+        return load_trail_file(path, chunksize)
+    except StrokeTrailError as exc:
+        return None, [str(exc)]
+    except (OSError, ValueError) as exc:
+        return None, [f"{path}: {exc}"]
+
+
+def load_archive(directory, workers=None, chunksize=DEFAULT_CHUNKSIZE, pattern=TRAIL_PATTERN):
+    """Load and merge every stroke-trail CSV in ``directory``.
+
+    Files are parsed across ``workers`` processes (default: CPU count).
+    Returns ``(table, errors)``; unreadable files are skipped and reported.
+    The merged table is built in memory, so the archive must fit in it.
+    """
+    paths = find_trail_files(directory, pattern)
+    if not paths:
+        return pd.DataFrame(columns=list(COLUMN_DTYPES)).astype(COLUMN_DTYPES), []
+
+    workers = workers or os.cpu_count() or 1
+    jobs = [(path, chunksize) for path in paths]
+    if workers == 1:
+        results = list(map(_load_worker, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_load_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    tables = [table for table, _ in results if table is not None and len(table)]
+    errors = [error for _, file_errors in results for error in file_errors]
+    if not tables:
+        return pd.DataFrame(columns=list(COLUMN_DTYPES)).astype(COLUMN_DTYPES), errors
+
+    table = pd.concat(tables, ignore_index=True).astype(COLUMN_DTYPES)
+    duplicated = table.duplicated(subset=ROUND_COLUMNS + ["Hole", "Stroke"])
+    if duplicated.any():
+        errors.append(f"{int(duplicated.sum())} duplicate shot rows dropped")
+        table = table[~duplicated].reset_index(drop=True)
+
+    return table, errors
+
+
+def summarize(scored):
+    """Per-round, per-player and per-tournament summaries of a scored table.
+
+    ``scored`` is the output of ``engine.add_strokes_gained``. Returns a dict
+    of DataFrames keyed ``"round"``, ``"player"`` and ``"tournament"``.
+    """
+    shots = scored[scored["Stroke"].notna()]
+    per_round = shots.groupby(ROUND_COLUMNS, dropna=False).agg(
+        Holes=("Hole", "nunique"), Strokes=("Stroke", "size"), SG=("Strokes Gained", "sum"),
+    )
+    # Par per round is the sum over its holes, not over its shots
+    holes = shots.drop_duplicates(ROUND_COLUMNS + ["Hole"])
+    per_round["Par"] = holes.groupby(ROUND_COLUMNS, dropna=False)["Par"].sum()
+    per_round["To Par"] = per_round["Strokes"] - per_round["Par"]
+    per_round = per_round.reset_index()
+
+    def rollup(keys):
+        out = (
+            per_round.groupby(keys, dropna=False)
+            .agg(Rounds=("Round", "size"), Strokes=("Strokes", "mean"),
+                 ToPar=("To Par", "mean"), SG=("SG", "sum"))
+            .reset_index()
+        )
+        out["SG per Round"] = out["SG"] / out["Rounds"]
+        return out.rename(columns={"Strokes": "Avg Strokes", "ToPar": "Avg To Par"})
+
+    return {
+        "round": per_round,
+        "player": rollup(["Player"]),
+        "tournament": rollup(["Tournament", "Player"]),
+    }
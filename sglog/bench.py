@@ -0,0 +1,148 @@
+"""Headless rerun-latency benchmark of the round entry workflow.
+
+Drives ``streamlit_app.py`` with Streamlit's ``AppTest`` through Step 1,
+both pages of Step 2, shot entry and saving for every hole of Step 3 and
+the Step 4 export. Every rerun records its wall time, the number of widgets
+on screen and the size of ``session_state`` so results can be compared
+across versions.
+
+The workflow runs in a child interpreter (``python -m sglog.bench``)
+pointed at a throwaway round store, so imports start cold and real rounds
+are never touched.
+"""
+
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from sglog import __version__
+from sglog.importtime import DEFAULT_SCRIPT
+
+
+def _session_size(at):
+    """(number of keys, pickled bytes) of an ``AppTest`` session state."""
+    state = {key: at.session_state[key] for key in at.session_state.keys()}
+    size = 0
+    for val in state.values():
+        try:
+            size += len(pickle.dumps(val))
+        except Exception:  # widgets may hold unpicklable values; count what we can
+            continue
+    return len(state), size
+
+
+def _widget_count(at):
+    from streamlit.testing.v1.element_tree import Widget
+
+    return sum(isinstance(node, Widget) for node in at.main)
+
+
+class _Recorder:
+    """Runs ``AppTest`` reruns and collects one result per step."""
+
+    def __init__(self, at):
+        self.at = at
+        self.steps = []
+
+    def run(self, step, action=None):
+        start = time.perf_counter()
+        (action or self.at).run()
+        wall_ms = (time.perf_counter() - start) * 1000
+        if self.at.exception:
+            raise RuntimeError(f"{step}: {self.at.exception[0].value}")
+        keys, size = _session_size(self.at)
+        self.steps.append({
+            "step": step,
+            "wall_ms": round(wall_ms, 2),
+            "widgets": _widget_count(self.at),
+            "session_keys": keys,
+            "session_bytes": size,
+        })
+
+
+def run_entry_workflow(script=DEFAULT_SCRIPT, num_holes=18, strokes=10, timeout=120):
+    """Play one round through the app and return the per-rerun results.
+
+    Every hole gets ``strokes`` shots, so Step 3 renders the largest form
+    the Score input allows.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    rec = _Recorder(at)
+    rec.run("start")
+
+    # Step 1
+    at.text_input[0].input("Bench Player")
+    at.text_input[1].input("Bench Open")
+    at.number_input[0].set_value(num_holes)
+    rec.run("step1 submit", at.button[0].click())
+
+    # Step 2, one page of nine holes at a time
+    holes_per_page = 9
+    for page_start in range(1, num_holes + 1, holes_per_page):
+        for hole in range(page_start, min(page_start + holes_per_page, num_holes + 1)):
+            at.number_input(key=f"score_{hole}").set_value(strokes)
+        if page_start + holes_per_page <= num_holes:
+            next_page = next(b for b in at.button if b.label.startswith("Second Nine"))
+            rec.run(f"step2 page {page_start // holes_per_page + 1}", next_page.click())
+    submit = next(b for b in at.button if b.label == "Submit Hole Info")
+    rec.run("step2 submit", submit.click())
+
+    # Step 3: fill every shot of a hole, then save and advance
+    for hole in range(1, num_holes + 1):
+        for shot in range(1, strokes + 1):
+            at.text_input(key=f"club_{hole}_{shot}").input("7i")
+        at.selectbox(key=f"lie_{hole}_{strokes}").set_value("Green")
+        rec.run(f"step3 hole {hole} edit")
+        rec.run(f"step3 hole {hole} save", at.button(key=f"save_{hole}").click())
+
+    # Step 4
+    generate = next(b for b in at.button if b.label == "Generate CSV")
+    rec.run("step4 export", generate.click())
+    return rec.steps
+
+
+def benchmark(script=DEFAULT_SCRIPT, num_holes=18, strokes=10):
+    """Run ``run_entry_workflow`` in a fresh interpreter and return a result dict.
+
+    The result carries the run's metadata and its ``steps``, ready to be
+    written as JSON.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SGLOG_DB=os.path.join(tmp, "bench.db"))
+        output = os.path.join(tmp, "steps.json")
+        proc = subprocess.run(
+            [sys.executable, "-m", "sglog.bench", str(script), str(num_holes), str(strokes), output],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise OSError(f"benchmark run failed:\n{proc.stderr.strip()}")
+        with open(output) as fh:
+            steps = json.load(fh)
+
+    import streamlit
+
+    return {
+        "sglog": __version__,
+        "streamlit": streamlit.__version__,
+        "python": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "num_holes": num_holes,
+        "strokes": strokes,
+        "total_ms": round(sum(step["wall_ms"] for step in steps), 2),
+        "steps": steps,
+    }
+
+
+if __name__ == "__main__":
+    script, num_holes, strokes, output = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+    with open(output, "w") as fh:
+        json.dump(run_entry_workflow(script, num_holes, strokes), fh)
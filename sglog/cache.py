@@ -0,0 +1,218 @@
+"""Process-wide caches shared by every session of a server.
+
+Two kinds of data are kept once per process instead of once per session:
+
+* static reference data that never changes while the process runs (the
+  tour baseline table): ``reference(name, loader)`` loads it on first use
+  and hands every caller the same object;
+* everything else, memoized in named ``LRUCache`` instances from
+  ``shared_cache``: data read from files or the round store (fitted
+  baselines, course templates) under a key that changes when its source
+  does, and per-round results (scorecards, strokes gained, exports) under a
+  ``content_key`` of the round's ``hole_table`` and ``shot_data``. Two
+  sessions showing the same round share one entry, and an edited round gets
+  a new key.
+
+Every ``LRUCache`` is bounded by entry count and approximate size, evicts the
+least recently used entry first and counts hits, misses and evictions;
+``cache_stats`` reports all of them for monitoring. Nothing here imports
+Streamlit.
+"""
+
+import hashlib
+import io
+import json
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64_000_000
+
+
+class _SizePickler(pickle.Pickler):
+    """Pickler writing objects whose ``id`` is in ``exclude`` as bare references."""
+
+    def __init__(self, file, exclude):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._exclude = exclude
+
+    def persistent_id(self, obj):
+        return id(obj) if id(obj) in self._exclude else None
+
+
+def approx_size(value, exclude=None):
+    """Serialized size of ``value`` in bytes, a close and cheap proxy for its memory.
+
+    Objects whose ``id`` is in ``exclude`` (see ``shared_ids``) count as a
+    few bytes wherever ``value`` refers to them.
+    """
+    try:
+        if not exclude:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        buffer = io.BytesIO()
+        _SizePickler(buffer, exclude).dump(value)
+        return buffer.tell()
+    except Exception:  # widget internals and locks are not picklable
+        return sys.getsizeof(value)
+
+
+def _plain(value):
+    if hasattr(value, "as_dicts"):  # model.Hole
+        return value.as_dicts()
+    if isinstance(value, dict):
+        return {str(key): _plain(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(val) for val in value]
+    return value
+
+
+def content_key(*parts):
+    """Stable hash of JSON-like ``parts``, e.g. a round's info, ``hole_table`` and ``shot_data``.
+
+    ``Hole`` records are hashed through their shot dicts, so the key only
+    changes when the round's contents do.
+    """
+    payload = json.dumps(_plain(parts), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entries and approximate bytes."""
+
+    __slots__ = ("name", "max_entries", "max_bytes", "hits", "misses", "evictions",
+                 "_entries", "_bytes", "_lock")
+
+    def __init__(self, name, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Cached value of ``key`` (marking it recently used), else ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store ``value``, evicting least recently used entries to stay in bounds.
+
+        A value larger than ``max_bytes`` on its own is not stored.
+        """
+        size = approx_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value of ``key``, computing and storing ``compute()`` on a miss.
+
+        The lock is not held while computing, so two sessions missing the
+        same key at once may both compute it; the last result is kept.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Entry count, approximate bytes and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_caches = {}
+_references = {}
+_registry_lock = threading.Lock()
+_reference_stats = {"hits": 0, "misses": 0}
+
+
+def shared_cache(name, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+    """The process-wide ``LRUCache`` called ``name``, created on first use."""
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = LRUCache(name, max_entries, max_bytes)
+        return cache
+
+
+def reference(name, loader):
+    """Process-wide read-only value ``name``, loaded once with ``loader()``.
+
+    Callers must not modify the returned object; it is shared by every
+    session. Reference data is never evicted, so it is only for a fixed set
+    of names whose value cannot change; use ``shared_cache`` for anything
+    read from a file or the round store. ``loader`` runs without holding
+    the registry lock; if two callers load the same name at once, both get
+    the first value stored.
+    """
+    with _registry_lock:
+        if name in _references:
+            _reference_stats["hits"] += 1
+            return _references[name]
+    value = loader()
+    with _registry_lock:
+        _reference_stats["misses"] += 1
+        return _references.setdefault(name, value)
+
+
+def shared_ids():
+    """``id`` of every ``reference`` value and every value held in a shared cache.
+
+    Sessions hold these objects without owning them; pass the set to
+    ``approx_size`` to leave them out of a session's size.
+    """
+    with _registry_lock:
+        ids = {id(value) for value in _references.values()}
+        caches = list(_caches.values())
+    for cache in caches:
+        with cache._lock:
+            ids.update(id(value) for value, _ in cache._entries.values())
+    return ids
+
+
+def cache_stats():
+    """Stats of every shared cache, plus ``reference`` entries and counters."""
+    with _registry_lock:
+        caches = list(_caches.values())
+        stats = {"reference": {"entries": len(_references), **_reference_stats}}
+    stats.update((cache.name, cache.stats()) for cache in caches)
+    return stats
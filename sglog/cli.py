@@ -0,0 +1,459 @@
+"""Command-line entry point: ``python -m sglog <command> ...``."""
+
+import argparse
+import sys
+
+from sglog.core import ROUND_COLUMNS
+from sglog.store import DEFAULT_DB_PATH
+
+
+def _read_inputs(inputs, workers=None):
+    """One stroke-trail table from CSV files and archive directories."""
+    from pathlib import Path
+
+    import pandas as pd
+
+    from sglog.batch import load_archive
+    from sglog.stroke_trail import read_stroke_trail
+
+    frames = []
+    for path in inputs:
+        if Path(path).is_dir():
+            table, errors = load_archive(path, workers=workers)
+            for error in errors:
+                print(f"warning: {error}", file=sys.stderr)
+            frames.append(table)
+        else:
+            frames.append(read_stroke_trail(path))
+    return pd.concat(frames, ignore_index=True)
+
+
+def cmd_score(args):
+    """Add strokes-gained columns to stroke-trail CSVs."""
+    import pandas as pd
+
+    from sglog.engine import add_strokes_gained
+    from sglog.stroke_trail import read_stroke_trail, write_table
+
+    df = pd.concat([read_stroke_trail(path) for path in args.inputs], ignore_index=True)
+    baseline = None
+    if args.baseline:
+        from sglog.baseline import load_baseline
+
+        baseline = load_baseline(args.baseline, segment=args.segment)
+        print(f"baseline {baseline.version}")
+    scored = add_strokes_gained(df, baseline)
+
+    if args.output:
+        write_table(scored, args.output)
+
+    totals = scored.groupby(ROUND_COLUMNS, dropna=False)["Strokes Gained"].sum()
+    for key, total in totals.items():
+        print(f"{' | '.join(map(str, key))}: {total:+.2f}")
+    return 0
+
+
+def cmd_batch(args):
+    """Merge a directory of stroke-trail CSVs and write season summaries."""
+    from pathlib import Path
+
+    from sglog.batch import load_archive, summarize
+    from sglog.engine import add_strokes_gained
+    from sglog.stroke_trail import write_table
+
+    table, errors = load_archive(args.directory, workers=args.workers, chunksize=args.chunksize)
+    for error in errors:
+        print(f"warning: {error}", file=sys.stderr)
+
+    scored = add_strokes_gained(table)
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    write_table(scored, output / "season_shots.csv")
+    for name, summary in summarize(scored).items():
+        write_table(summary, output / f"summary_by_{name}.csv")
+
+    print(f"{len(scored)} shots from {scored['Player'].nunique()} players written to {output}")
+    return 0
+
+
+def cmd_index(args):
+    """Import stroke-trail CSVs into the season store."""
+    from sglog.batch import load_archive
+    from sglog.dispersion import shot_histograms
+    from sglog.engine import add_strokes_gained, category_rollup
+    from sglog.store import RoundStore
+    from sglog.stroke_trail import split_rounds
+
+    table, errors = load_archive(args.directory, workers=args.workers)
+    for error in errors:
+        print(f"warning: {error}", file=sys.stderr)
+
+    store = RoundStore(args.db)
+    ids = store.import_rounds(split_rounds(table))
+
+    # split_rounds yields rounds in sorted ROUND_COLUMNS order, which is
+    # also the group order here
+    scored = add_strokes_gained(table)
+    scored["Round Id"] = [ids[i] for i in scored.groupby(ROUND_COLUMNS, dropna=False).ngroup()]
+    rollups = {}
+    for round_id, *row in category_rollup(scored, ["Round Id"]).itertuples(index=False, name=None):
+        rollups.setdefault(round_id, []).append(row)
+    store.save_rollups(rollups)
+    histograms = {}
+    for round_id, *row in shot_histograms(scored, ["Round Id"]).itertuples(index=False, name=None):
+        histograms.setdefault(round_id, []).append(row)
+    store.save_histograms(histograms)
+    store.close()
+    print(f"{len(ids)} rounds indexed into {args.db}")
+    return 0
+
+
+def cmd_query(args):
+    """Print shots from the season store matching the given filters."""
+    from sglog.store import RoundStore
+    from sglog.stroke_trail import COLUMN_DTYPES, rows_to_frame, write_table
+
+    store = RoundStore(args.db)
+    rows = store.query_shots(player=args.player, tournament=args.tournament,
+                             round_number=args.round, round_type=args.type,
+                             date_from=args.date_from, date_to=args.date_to, par=args.par)
+    store.close()
+    write_table(rows_to_frame(rows).astype(COLUMN_DTYPES), args.output or sys.stdout)
+    return 0
+
+
+def cmd_categories(args):
+    """Print strokes gained per category from the season store's rollups."""
+    from sglog.engine import category_table
+    from sglog.store import RoundStore
+
+    store = RoundStore(args.db)
+    rows = store.query_rollups(by=args.by, player=args.player, tournament=args.tournament,
+                               round_type=args.type, date_from=args.date_from, date_to=args.date_to)
+    store.close()
+    if not rows:
+        print("no scored rounds match")
+        return 0
+    print(category_table(rows, args.by, per_round=not args.totals).round(2).to_string())
+    return 0
+
+
+def cmd_dispersion(args):
+    """Print outcome rates of a dispersion histogram from the season store."""
+    from sglog.dispersion import rate_table
+    from sglog.store import RoundStore
+
+    store = RoundStore(args.db)
+    rows = store.query_histograms(histogram=args.histogram, by=args.by, player=args.player,
+                                  tournament=args.tournament, round_type=args.type,
+                                  date_from=args.date_from, date_to=args.date_to)
+    store.close()
+    if not rows:
+        print("no indexed shots match")
+        return 0
+    by = [*args.by, "label"] + ([] if args.no_buckets else ["bucket"])
+    print(rate_table(rows, args.histogram, by).round(1).to_string())
+    return 0
+
+
+def cmd_leaderboard(args):
+    """Print a tournament leaderboard, optionally refreshing it as rounds arrive."""
+    import time
+
+    from sglog.batch import find_trail_files
+    from sglog.leaderboard import Leaderboard
+    from sglog.store import RoundStore
+
+    baseline = None
+    if args.baseline:
+        from functools import partial
+
+        from sglog.baseline import load_baseline
+
+        # Each round is scored against its round type's segment
+        baseline = partial(load_baseline, args.baseline)
+    board = Leaderboard(args.tournament, args.round, baseline=baseline)
+    store = RoundStore(args.db) if args.directory is None else None
+    try:
+        while True:
+            if store is not None:
+                changed = board.refresh_store(store)
+            else:
+                changed = board.refresh_files(find_trail_files(args.directory), workers=args.workers)
+            if changed:
+                table = board.table()
+                print(f"{args.tournament}: {len(table)} players ({changed} updated)")
+                print(table.round(2).to_string(index=False) if len(table) else "no shots yet")
+            if not args.watch:
+                return 0
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if store is not None:
+            store.close()
+
+
+def cmd_validate(args):
+    """Check the shot sequences of stroke-trail CSVs or archive directories."""
+    from sglog.stroke_trail import write_table
+    from sglog.validate import RULES, error_report, validate_shots
+
+    df = _read_inputs(args.inputs, args.workers)
+
+    errors = validate_shots(df)
+    print(f"{len(errors)} problems in {len(df)} shots")
+    for rule, count in errors["rule"].value_counts(sort=False).items():
+        if count:
+            print(f"  {rule:<18} {count:>7}  {RULES[rule]}")
+    if args.output:
+        write_table(error_report(df, errors), args.output)
+    return 1 if len(errors) else 0
+
+
+def cmd_fit(args):
+    """Fit expected-strokes baselines from stroke-trail CSVs or archive directories."""
+    from sglog.fit import fit_baselines, save_baseline
+
+    df = _read_inputs(args.inputs, args.workers)
+
+    segments = fit_baselines(df, by=None if args.no_segments else "Round Type", min_shots=args.min_shots)
+    version = save_baseline(args.output, segments)
+    print(f"baseline {version} fitted on {len(df)} shots, written to {args.output}")
+    for name, lies in segments.items():
+        fitted = [lie for lie, fit in lies.items() if fit.get("fitted", True)]
+        print(f"  {name:<12} {sum(fit['shots'] for fit in lies.values()):>8} shots"
+              f"  fitted: {', '.join(fitted) or 'none'}")
+    return 0
+
+
+def cmd_simulate(args):
+    """Simulate a player's rounds on a stored course, optionally with team-average categories."""
+    from sglog.simulate import build_shot_model, score_summary, simulate
+    from sglog.store import RoundStore
+
+    store = RoundStore(args.db)
+    if args.round_id is not None:
+        loaded = store.load_round(args.round_id)
+        holes = loaded and loaded["hole_table"]
+    else:
+        match = [c for c in store.list_courses()
+                 if c["name"] == args.course and (args.tees is None or c["tees"] == args.tees)]
+        holes = store.load_course(match[0]["id"]) if match else None
+    store.close()
+    if not holes:
+        raise ValueError(f"no stored {'round' if args.round_id is not None else 'course'} matches")
+    if None in holes["Par"] or None in holes["Yardage"]:
+        raise ValueError("every hole needs a par and yardage")
+
+    model = build_shot_model(_read_inputs(args.inputs, args.workers))
+    if args.player not in model.players:
+        raise ValueError(f"no logged shots for {args.player!r}")
+    runs = {"as logged": ()}
+    if args.team:
+        runs[f"team {', '.join(args.team)}"] = args.team
+    print(f"{args.rounds} rounds of {args.player} over {len(holes['Hole'])} holes "
+          f"(par {sum(holes['Par'])}, {sum(holes['Yardage'])} yards)")
+    for label, categories in runs.items():
+        strokes = simulate(model, args.player, holes["Par"], holes["Yardage"], rounds=args.rounds,
+                           team_categories=categories, seed=args.seed, workers=args.workers)
+        summary = score_summary(strokes, holes["Par"])
+        print(f"  {label:<32} mean {summary['mean']:6.2f} ({summary['to_par']:+.2f})"
+              f"  sd {summary['std']:4.2f}  p10/50/90 {summary['p10']:.0f}/{summary['p50']:.0f}/{summary['p90']:.0f}")
+    return 0
+
+
+def cmd_export(args):
+    """Convert stroke-trail CSVs to Parquet/Arrow or append them to a dataset."""
+    import pandas as pd
+
+    from sglog import columnar
+    from sglog.stroke_trail import read_stroke_trail
+
+    df = pd.concat([read_stroke_trail(path) for path in args.inputs], ignore_index=True)
+    if args.dataset:
+        columnar.append_to_dataset(df, args.dataset)
+        print(f"{len(df)} shots appended to {args.dataset}")
+        return 0
+
+    if not args.output:
+        raise ValueError("export needs --output or --dataset")
+    writer = columnar.to_arrow_bytes if args.format == "arrow" else columnar.to_parquet_bytes
+    with open(args.output, "wb") as fh:
+        fh.write(writer(df))
+    print(f"{len(df)} shots written to {args.output}")
+    return 0
+
+
+def cmd_importtime(args):
+    """Print the cold-start import breakdown of the app and flag heavy imports."""
+    from sglog.importtime import (
+        DEFAULT_SCRIPT, HEAVY_MODULES, imported, package_totals, profile_script,
+    )
+
+    script = args.script or DEFAULT_SCRIPT
+    records = profile_script(script)
+    totals = package_totals(records)
+
+    print(f"{sum(totals.values()) / 1000:.1f} ms of imports at startup of {script}")
+    for package, us in list(totals.items())[:args.top]:
+        print(f"  {package:<24} {us / 1000:8.1f} ms")
+
+    heavy = imported(records, HEAVY_MODULES if args.forbid is None else args.forbid)
+    if heavy:
+        print(f"sglog: error: imported at startup: {', '.join(heavy)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_bench(args):
+    """Time every rerun of a scripted round entry and write the results as JSON."""
+    import json
+
+    from sglog.bench import benchmark
+
+    result = benchmark(num_holes=args.holes, strokes=args.strokes)
+    with open(args.output, "w") as fh:
+        json.dump(result, fh, indent=2)
+
+    steps = result["steps"]
+    slowest = max(steps, key=lambda step: step["wall_ms"])
+    print(f"{len(steps)} reruns in {result['total_ms'] / 1000:.2f} s, slowest {slowest['step']!r} "
+          f"({slowest['wall_ms']:.0f} ms); results written to {args.output}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sglog", description="Strokes Gained Log tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="Compute strokes gained for stroke-trail CSVs")
+    score.add_argument("inputs", nargs="+", help="Stroke-trail CSV files")
+    score.add_argument("-o", "--output", help="Write the scored table to this CSV")
+    score.add_argument("--baseline", help="Fitted baseline file (default: tour baseline)")
+    score.add_argument("--segment", help="Baseline segment, e.g. Competitive (default: all rounds)")
+    score.set_defaults(func=cmd_score)
+
+    batch = commands.add_parser("batch", help="Merge and summarize a directory of stroke-trail CSVs")
+    batch.add_argument("directory", help="Directory searched for *_Stroke_Trail.csv files")
+    batch.add_argument("-o", "--output", default="season_output", help="Output directory")
+    batch.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    batch.add_argument("--chunksize", type=int, default=5000, help="Rows parsed per chunk of a file (the merged archive is held in memory)")
+    batch.set_defaults(func=cmd_batch)
+
+    validate = commands.add_parser("validate", help="Check stroke-trail shot sequences")
+    validate.add_argument("inputs", nargs="+", help="Stroke-trail CSV files or archive directories")
+    validate.add_argument("-o", "--output", help="Write every problem to this CSV")
+    validate.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    validate.set_defaults(func=cmd_validate)
+
+    fit = commands.add_parser("fit", help="Fit expected-strokes baselines from stroke-trail CSVs")
+    fit.add_argument("inputs", nargs="+", help="Stroke-trail CSV files or archive directories")
+    fit.add_argument("-o", "--output", default="baseline.json", help="Baseline file to write")
+    fit.add_argument("--min-shots", type=int, default=50, help="Fewest shots for a lie to be fitted")
+    fit.add_argument("--no-segments", action="store_true", help="Only fit all round types together")
+    fit.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    fit.set_defaults(func=cmd_fit)
+
+    sim = commands.add_parser("simulate", help="Monte Carlo rounds of a player on a stored course")
+    sim.add_argument("inputs", nargs="+", help="Stroke-trail CSV files or archive directories")
+    sim.add_argument("--player", required=True)
+    target = sim.add_mutually_exclusive_group(required=True)
+    target.add_argument("--course", help="Course from the course library")
+    target.add_argument("--round-id", type=int, help="Stored round whose holes are played")
+    sim.add_argument("--tees", help="Tees of --course (default: first saved)")
+    sim.add_argument("--db", default=DEFAULT_DB_PATH, help="Round store database")
+    sim.add_argument("--rounds", type=int, default=100_000, help="Simulated rounds")
+    sim.add_argument("--team", nargs="+", choices=["Off the Tee", "Approach", "Around the Green", "Putting"],
+                     help="Also simulate with these categories played at the team average")
+    sim.add_argument("--seed", type=int, help="Random seed for repeatable results")
+    sim.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    sim.set_defaults(func=cmd_simulate)
+
+    export = commands.add_parser("export", help="Convert stroke-trail CSVs to Parquet or Arrow")
+    export.add_argument("inputs", nargs="+", help="Stroke-trail CSV files")
+    export.add_argument("-f", "--format", choices=["parquet", "arrow"], default="parquet")
+    export.add_argument("-o", "--output", help="Output file")
+    export.add_argument("--dataset", help="Append to this partitioned Parquet dataset instead")
+    export.set_defaults(func=cmd_export)
+
+    index = commands.add_parser("index", help="Import a directory of stroke-trail CSVs into the season store")
+    index.add_argument("directory", help="Directory searched for *_Stroke_Trail.csv files")
+    index.add_argument("--db", default=DEFAULT_DB_PATH, help="Season store database")
+    index.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    index.set_defaults(func=cmd_index)
+
+    query = commands.add_parser("query", help="Query shots from the season store")
+    query.add_argument("--db", default=DEFAULT_DB_PATH, help="Season store database")
+    query.add_argument("--player")
+    query.add_argument("--tournament")
+    query.add_argument("--round", type=int)
+    query.add_argument("--type", choices=["Competitive", "Practice"])
+    query.add_argument("--date-from", help="First round date (YYYY-MM-DD)")
+    query.add_argument("--date-to", help="Last round date (YYYY-MM-DD)")
+    query.add_argument("--par", type=int, choices=[3, 4, 5])
+    query.add_argument("-o", "--output", help="Write matching shots to this CSV (default: stdout)")
+    query.set_defaults(func=cmd_query)
+
+    categories = commands.add_parser("categories", help="Strokes gained per category from the season store")
+    categories.add_argument("--db", default=DEFAULT_DB_PATH, help="Season store database")
+    categories.add_argument("--by", nargs="+", default=["player", "season"],
+                            choices=["player", "season", "tournament", "round", "round_type", "bucket"])
+    categories.add_argument("--player")
+    categories.add_argument("--tournament")
+    categories.add_argument("--type", choices=["Competitive", "Practice"])
+    categories.add_argument("--date-from", help="First round date (YYYY-MM-DD)")
+    categories.add_argument("--date-to", help="Last round date (YYYY-MM-DD)")
+    categories.add_argument("--totals", action="store_true", help="Show totals instead of per-round averages")
+    categories.set_defaults(func=cmd_categories)
+
+    dispersion = commands.add_parser("dispersion", help="Miss-pattern and make rates from the season store")
+    dispersion.add_argument("histogram", choices=["miss", "pin_high", "on_line", "putt", "foul_ball"])
+    dispersion.add_argument("--db", default=DEFAULT_DB_PATH, help="Season store database")
+    dispersion.add_argument("--by", nargs="*", default=[],
+                            choices=["player", "season", "tournament", "round", "round_type"],
+                            help="Group rows by these besides club (putt break for putts)")
+    dispersion.add_argument("--no-buckets", action="store_true", help="Sum over distance buckets")
+    dispersion.add_argument("--player")
+    dispersion.add_argument("--tournament")
+    dispersion.add_argument("--type", choices=["Competitive", "Practice"])
+    dispersion.add_argument("--date-from", help="First round date (YYYY-MM-DD)")
+    dispersion.add_argument("--date-to", help="Last round date (YYYY-MM-DD)")
+    dispersion.set_defaults(func=cmd_dispersion)
+
+    leaderboard = commands.add_parser("leaderboard", help="Tournament leaderboard with strokes gained")
+    leaderboard.add_argument("tournament")
+    leaderboard.add_argument("--round", type=int, help="Only this round (default: every round)")
+    leaderboard.add_argument("--db", default=DEFAULT_DB_PATH, help="Round store database")
+    leaderboard.add_argument("--baseline", help="Fitted baseline file (default: tour baseline)")
+    leaderboard.add_argument("--dir", dest="directory",
+                             help="Read players' stroke-trail CSVs from this directory instead of the store")
+    leaderboard.add_argument("--watch", type=float, metavar="SECONDS",
+                             help="Keep refreshing, printing the board whenever rounds change")
+    leaderboard.add_argument("-j", "--workers", type=int, help="Worker processes (default: CPU count)")
+    leaderboard.set_defaults(func=cmd_leaderboard)
+
+    importtime = commands.add_parser("importtime", help="Show what the app imports at cold start")
+    importtime.add_argument("script", nargs="?", help="Script to profile (default: streamlit_app.py)")
+    importtime.add_argument("--top", type=int, default=15, help="Packages listed")
+    importtime.add_argument("--forbid", nargs="*",
+                            help="Fail if any of these packages is imported (default: pandas numpy pyarrow)")
+    importtime.set_defaults(func=cmd_importtime)
+
+    bench = commands.add_parser("bench", help="Benchmark app reruns over a scripted round entry")
+    bench.add_argument("-o", "--output", default="bench.json", help="JSON results file")
+    bench.add_argument("--holes", type=int, default=18, choices=range(1, 19), metavar="{1..18}")
+    bench.add_argument("--strokes", type=int, default=10, choices=range(1, 11), metavar="{1..10}",
+                       help="Shots entered on every hole")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"sglog: error: {exc}", file=sys.stderr)
+        return 1
@@ -0,0 +1,125 @@
+"""Parquet / Arrow export of stroke-trail tables.
+
+Columnar files carry a fixed typed schema, so downstream analytics can load
+a season without re-parsing text or re-inferring column types. Rounds can
+also be appended to one partitioned Parquet dataset (by season and player)
+that is read back in a single columnar scan.
+
+Needs the optional ``pyarrow`` dependency.
+"""
+
+import uuid
+
+import pandas as pd
+
+from sglog.core import ALL_COLUMNS
+
+# Partition columns added to dataset writes
+PARTITION_COLUMNS = ["Season", "Player"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401 - registers pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet/Arrow export needs pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def is_available():
+    """Whether ``pyarrow`` can be imported."""
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def stroke_trail_schema():
+    """Arrow schema for the ``ALL_COLUMNS`` stroke-trail layout."""
+    pa = _pyarrow()
+    return pa.schema([
+        ('Player', pa.string()),
+        ('RndDate', pa.date32()),
+        ('Tournament', pa.string()),
+        ('Round', pa.int8()),
+        ('Round Type', pa.string()),
+        ('Hole', pa.int8()),
+        ('Par', pa.int8()),
+        ('Stroke', pa.int8()),
+        ('Club', pa.string()),
+        ('Lie', pa.string()),
+        ('Pin Distance', pa.float32()),
+        ('Pin Location', pa.string()),
+        ('Miss Direction', pa.string()),
+        ('Pin-High', pa.int8()),
+        ('On-Line', pa.int8()),
+        ('Putt Break', pa.string()),
+        ('Foul Ball', pa.string()),
+    ])
+
+
+def _normalized(df):
+    """Copy of ``df`` with values coerced to match ``stroke_trail_schema``."""
+    out = df[ALL_COLUMNS].copy()
+    out['RndDate'] = pd.to_datetime(out['RndDate'], errors="coerce").dt.date
+    for col in ('Round', 'Hole', 'Par', 'Stroke', 'Pin-High', 'On-Line'):
+        # Unselected Pin-High / On-Line widgets export as ""
+        out[col] = pd.to_numeric(out[col].replace("", None), errors="coerce").astype("Int8")
+    out['Pin Distance'] = pd.to_numeric(out['Pin Distance'], errors="coerce").astype("Float32")
+    for col in ('Player', 'Tournament', 'Round Type', 'Club', 'Lie', 'Pin Location',
+                'Miss Direction', 'Putt Break', 'Foul Ball'):
+        out[col] = out[col].astype("string")
+    return out
+
+
+def to_arrow_table(df):
+    """Arrow table with the stroke-trail schema from a stroke-trail DataFrame."""
+    pa = _pyarrow()
+    return pa.Table.from_pandas(_normalized(df), schema=stroke_trail_schema(),
+                                preserve_index=False)
+
+
+def to_parquet_bytes(df):
+    """Parquet file contents for a stroke-trail DataFrame."""
+    pa = _pyarrow()
+    sink = pa.BufferOutputStream()
+    pa.parquet.write_table(to_arrow_table(df), sink)
+    return sink.getvalue().to_pybytes()
+
+
+def to_arrow_bytes(df):
+    """Arrow IPC (Feather v2) file contents for a stroke-trail DataFrame."""
+    pa = _pyarrow()
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def append_to_dataset(df, root):
+    """Append rounds to a Parquet dataset partitioned by season and player.
+
+    Each call writes new files only, so existing rounds are never rewritten.
+    """
+    pa = _pyarrow()
+    table = to_arrow_table(df)
+    season = pd.to_datetime(df['RndDate'], errors="coerce").dt.year.astype("Int16")
+    table = table.append_column("Season", pa.array(season, type=pa.int16()))
+    pa.parquet.write_to_dataset(
+        table, root, partition_cols=PARTITION_COLUMNS,
+        basename_template=f"{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def read_dataset(root, filters=None, columns=None):
+    """Read a dataset written by ``append_to_dataset`` as one Arrow table.
+
+    ``filters`` are pyarrow predicates such as ``[("Season", "=", 2026)]``
+    and prune whole partitions before any data is read.
+    """
+    pa = _pyarrow()
+    return pa.parquet.read_table(root, filters=filters, columns=columns)
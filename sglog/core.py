@@ -0,0 +1,165 @@
+"""Round data helpers shared by the Streamlit app and the command line.
+
+Nothing here imports Streamlit or pandas: widget keys and options are plain
+constants and export rows are plain dicts in the stroke-trail CSV layout.
+Shot records themselves live in ``sglog.model``.
+"""
+
+# Stroke-trail CSV layout written by Step 4 and read back by the CLI
+ALL_COLUMNS = [
+    'Player', 'RndDate', 'Tournament', 'Round', 'Round Type',
+    'Hole', 'Par', 'Stroke', 'Club', 'Lie',
+    'Pin Distance', 'Pin Location', 'Miss Direction',
+    'Pin-High', 'On-Line', 'Putt Break', 'Foul Ball'
+]
+
+# Columns identifying one round in the stroke-trail layout
+ROUND_COLUMNS = ['Player', 'RndDate', 'Tournament', 'Round', 'Round Type']
+
+# Stroke-trail column -> shot dict key
+SHOT_FIELD_COLUMNS = {
+    'Club': "Club",
+    'Lie': "Lie",
+    'Pin Distance': "PinDistance",
+    'Miss Direction': "MissDirection",
+    'Pin-High': "PinHigh",
+    'On-Line': "OnLine",
+    'Putt Break': "PuttBreak",
+    'Foul Ball': "FoulBall",
+}
+
+# Widget options, shared with the Step 2 / Step 3 forms
+PIN_LOCATIONS = ["C", "FL", "FR", "BL", "BR"]
+LIE_OPTIONS = ["Tee", "Fairway", "Rough", "Sand", "Green", "Other", ""]
+MISS_DIRECTIONS = ["", "Left", "Right", "Short", "Long"]
+BINARY_OPTIONS = ["", 1, 0]
+FOUL_BALL_OPTIONS = ["No", "Yes"]
+PUTT_BREAKS = ["Straight", "Uphill-L2R", "Uphill-R2L", "Downhill-L2R", "Downhill-R2L", "Tap-In"]
+
+# Step 2 widget defaults, used for holes missing from an imported round
+HOLE_DEFAULTS = {"Par": 4, "Score": 4, "Yardage": 400, "Pin": "C"}
+
+# Step 2 widget bounds (inclusive)
+HOLE_LIMITS = {"Par": (3, 5), "Score": (1, 10), "Yardage": (50, 800)}
+
+# Step 3 Pin Distance bounds (inclusive; -1 is "not entered"), whole numbers only
+PIN_DISTANCE_LIMITS = (-1, 1000)
+
+# Session-state key prefix for each per-shot widget
+SHOT_KEY_PREFIXES = {
+    "Club": "club",
+    "Lie": "lie",
+    "PinDistance": "pd",
+    "MissDirection": "md",
+    "PinHigh": "ph",
+    "OnLine": "ol",
+    "FoulBall": "fb",
+    "PuttBreak": "pb",
+}
+
+# Value used when a widget has not been rendered yet
+SHOT_DEFAULTS = {
+    "Club": "",
+    "Lie": "Tee",
+    "PinDistance": -1,
+    "MissDirection": "",
+    "PinHigh": "",
+    "OnLine": "",
+    "FoulBall": "No",
+    "PuttBreak": "Straight",
+}
+
+
+def shot_key(field, hole, shot):
+    """Session-state key of a Step 3 shot widget, e.g. ``pd_3_2``."""
+    return f"{SHOT_KEY_PREFIXES[field]}_{hole}_{shot}"
+
+
+def conditional_fields(lie, par):
+    """Extra fields recorded for a shot from ``lie`` on a par ``par`` hole."""
+    if lie == "Tee":
+        return ("PinHigh", "OnLine") if par == 3 else ("FoulBall",)
+    if lie == "Green":
+        return ("PuttBreak",)
+    return ("PinHigh", "OnLine")
+
+
+def format_to_par(total_score, total_par):
+    """Score relative to par as shown on a scorecard: ``+3``, ``-1`` or ``E``."""
+    diff = total_score - total_par
+    if diff > 0:
+        return f"+{diff}"
+    if diff < 0:
+        return f"{diff}"
+    return "E"
+
+
+def complete_hole_table(hole_table):
+    """Hole table numbered 1..last hole with every field filled in.
+
+    Holes missing from ``hole_table`` and fields left empty (a hole without
+    shots has no Score, one without a tee shot no Yardage) get
+    ``HOLE_DEFAULTS``, and so do values the Step 2 widgets cannot show: an
+    unknown Pin or a Par or Yardage outside ``HOLE_LIMITS`` (a tee shot's
+    pin distance of ``-1``, say). A Score above the limit is lowered to it.
+    Returns the new table and the numbers of the holes that were changed.
+    """
+    rows = {hole: i for i, hole in enumerate(hole_table["Hole"])}
+    num_holes = max(rows, default=0)
+    table = {"Hole": list(range(1, num_holes + 1))}
+    filled = set()
+    for field, default in HOLE_DEFAULTS.items():
+        low, high = HOLE_LIMITS.get(field, (None, None))
+        column = []
+        for hole in table["Hole"]:
+            val = hole_table[field][rows[hole]] if hole in rows else None
+            if field == "Score" and val is not None and val > high:
+                filled.add(hole)
+                val = high
+            elif val is None or (field == "Pin" and val not in PIN_LOCATIONS) or (
+                    low is not None and not low <= val <= high):
+                filled.add(hole)
+                val = default
+            column.append(val)
+        table[field] = column
+    return table, sorted(filled)
+
+
+def round_info(state):
+    """Round-level export columns from the Step 1 values in ``state``."""
+    return {
+        'Player': state.get("player_name", ""),
+        'RndDate': state.get("round_date", ""),
+        'Tournament': state.get("tournament_name", ""),
+        'Round': state.get("round_number", ""),
+        'Round Type': state.get("round_type", ""),
+    }
+
+
+def build_export_rows(info, hole_table, shot_data, holes):
+    """Stroke-trail rows (dicts keyed by ``ALL_COLUMNS``) for ``holes``.
+
+    Holes without saved shots still get one row carrying the hole info.
+    Missing values are ``None``.
+    """
+    rows = []
+    for hole_num in sorted(holes):
+        base_data = dict(info)
+        base_data.update({
+            'Hole': hole_num,
+            'Par': hole_table['Par'][hole_num - 1],
+        })
+        pin_location = hole_table['Pin'][hole_num - 1]
+
+        shots = shot_data.get(hole_num)
+        if not shots:
+            shots = [{}]
+
+        for shot in shots:
+            row = base_data.copy()
+            row['Stroke'] = shot.get('ShotNumber')
+            row['Pin Location'] = pin_location
+            row.update({col: shot.get(key) for col, key in SHOT_FIELD_COLUMNS.items()})
+            rows.append(row)
+
+    return rows
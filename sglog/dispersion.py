@@ -0,0 +1,94 @@
+"""Dispersion and miss-pattern histograms.
+
+Each round's shots are counted once into pre-binned histograms, stored in
+the season store next to the strokes-gained rollups, so dashboards over any
+number of seasons only sum a few rows per round:
+
+``miss``
+    Non-putts by club and distance bucket; outcome is the ``Miss
+    Direction`` (``On Target`` when none was recorded).
+``pin_high`` / ``on_line``
+    Shots that recorded ``Pin-High`` / ``On-Line``, by club and distance
+    bucket; outcome ``Yes`` or ``No``.
+``putt``
+    Putts by ``Putt Break`` and distance bucket; outcome ``Made`` when the
+    putt is the hole's last shot, else ``Missed``.
+``foul_ball``
+    Tee shots on par 4/5 by club and distance bucket; outcome ``Yes`` or
+    ``No``.
+
+Distance buckets are the strokes-gained category buckets of
+``engine.add_sg_categories``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sglog.engine import HOLE_KEY_COLUMNS, add_sg_categories
+
+HISTOGRAMS = ["miss", "pin_high", "on_line", "putt", "foul_ball"]
+HISTOGRAM_COLUMNS = ["Histogram", "Label", "Bucket", "Outcome"]
+
+# Outcome order of each histogram's rate table
+OUTCOMES = {
+    "miss": ["On Target", "Left", "Right", "Short", "Long"],
+    "pin_high": ["Yes", "No"],
+    "on_line": ["Yes", "No"],
+    "putt": ["Made", "Missed"],
+    "foul_ball": ["Yes", "No"],
+}
+
+_YES_NO = {1: "Yes", 0: "No", "1": "Yes", "0": "No", "Yes": "Yes", "No": "No"}
+
+
+def shot_histograms(df, keys=()):
+    """Shot counts per ``keys`` x ``HISTOGRAM_COLUMNS`` of a stroke-trail table."""
+    binned = add_sg_categories(df)
+    club = binned["Club"].fillna("").replace("", "Unknown")
+    bucket = binned["Distance Bucket"]
+    lie = binned["Lie"].fillna("")
+    stroke = pd.to_numeric(binned["Stroke"], errors="coerce")
+    last = stroke.groupby([binned[col] for col in HOLE_KEY_COLUMNS], sort=False,
+                          dropna=False).transform("max")
+    putts = lie.eq("Green")
+
+    parts = {
+        "miss": (~putts & lie.ne(""), club,
+                 binned["Miss Direction"].fillna("").replace("", "On Target")),
+        "pin_high": (None, club, binned["Pin-High"].map(_YES_NO)),
+        "on_line": (None, club, binned["On-Line"].map(_YES_NO)),
+        "putt": (putts, binned["Putt Break"].fillna("Unknown"),
+                 pd.Series(np.where(stroke.eq(last), "Made", "Missed"), index=binned.index)),
+        "foul_ball": (binned["SG Category"].eq("Off the Tee"), club, binned["Foul Ball"].map(_YES_NO)),
+    }
+    frames = []
+    for name, (mask, label, outcome) in parts.items():
+        mask = outcome.notna() if mask is None else mask & outcome.notna()
+        frame = binned.loc[mask, list(keys)]
+        frame["Histogram"] = name
+        frame["Label"] = label[mask]
+        frame["Bucket"] = bucket[mask]
+        frame["Outcome"] = outcome[mask]
+        frames.append(frame)
+
+    by = list(keys) + HISTOGRAM_COLUMNS
+    counts = pd.concat(frames, ignore_index=True).groupby(by, sort=True, dropna=False).size()
+    return counts.rename("Shots").reset_index()
+
+
+def rate_table(rows, histogram, by=("label", "bucket")):
+    """Percent of shots per outcome of one histogram from ``query_histograms`` rows.
+
+    One row per ``by`` key, one column per outcome in ``OUTCOMES`` order
+    plus ``Shots``.
+    """
+    df = pd.DataFrame(rows, columns=sorted({*by, "histogram", "outcome", "shots"}))
+    df = df[df["histogram"] == histogram]
+    counts = df.pivot_table(index=list(by), columns="outcome", values="shots", aggfunc="sum",
+                            fill_value=0)
+    counts = counts.reindex(columns=OUTCOMES[histogram], fill_value=0)
+    counts.columns.name = None
+    shots = counts.sum(axis=1)
+    table = counts.div(shots, axis=0) * 100
+    table["Shots"] = shots
+    return table
@@ -0,0 +1,153 @@
+"""Vectorized strokes-gained engine.
+
+Works on the stroke-trail table built in Step 4 of the app (one row per shot,
+columns as in the CSV export). Every shot is scored as::
+
+    SG = E(lie, distance) - E(next lie, next distance) - 1
+
+where ``E`` is the expected number of strokes to hole out and the last shot
+of a hole is followed by the hole itself (``E = 0``). Pin distances are in
+yards for every lie except ``Green``, where they are in feet.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sglog.baseline import default_baseline
+from sglog.core import ROUND_COLUMNS
+
+# Identifies one hole of one round in the stroke-trail table
+HOLE_KEY_COLUMNS = [*ROUND_COLUMNS, "Hole"]
+
+
+def expected_strokes(lies, distances, baseline=None):
+    """Expected strokes to hole out for arrays of lies and pin distances.
+
+    Unknown lies and negative (not entered) distances give ``NaN``.
+    """
+    if baseline is None:
+        baseline = default_baseline()
+    return baseline.expected_strokes(lies, distances)
+
+
+def add_strokes_gained(df, baseline=None, hole_keys=HOLE_KEY_COLUMNS):
+    """Return a copy of a stroke-trail table with per-shot SG columns.
+
+    Adds ``Expected Strokes`` (before the shot) and ``Strokes Gained``. Rows
+    are scored in ``Stroke`` order within each hole, whatever order they come
+    in, so a whole season archive can be scored in one call. ``baseline``
+    defaults to the shared tour table. ``hole_keys`` are the columns that
+    identify one hole, e.g. with a stored ``Round Id`` added.
+    """
+    out = df.copy()
+    n = len(out)
+    if n == 0:
+        out["Expected Strokes"] = pd.Series(dtype=float)
+        out["Strokes Gained"] = pd.Series(dtype=float)
+        return out
+
+    stroke = pd.to_numeric(out["Stroke"], errors="coerce").to_numpy(dtype=float)
+    distance = pd.to_numeric(out["Pin Distance"], errors="coerce").to_numpy(dtype=float)
+    lie = out["Lie"].fillna("").to_numpy(dtype=object)
+    hole_id = out.groupby(list(hole_keys), sort=False, dropna=False).ngroup().to_numpy()
+
+    # Sort shots into play order: by hole, then by stroke number
+    order = np.lexsort((stroke, hole_id))
+    expected = expected_strokes(lie[order], distance[order], baseline)
+
+    # Expected strokes after each shot: the next shot's value, or 0 once holed
+    expected_after = np.zeros(n)
+    expected_after[:-1] = expected[1:]
+    last_shot = np.ones(n, dtype=bool)
+    last_shot[:-1] = hole_id[order][1:] != hole_id[order][:-1]
+    expected_after[last_shot] = 0.0
+
+    sg = np.empty(n)
+    sg[order] = expected - expected_after - 1.0
+    exp_before = np.empty(n)
+    exp_before[order] = expected
+
+    out["Expected Strokes"] = exp_before
+    out["Strokes Gained"] = sg
+    return out
+
+
+# Strokes-gained categories and the distance buckets used to break them down
+SG_CATEGORIES = ["Off the Tee", "Approach", "Around the Green", "Putting"]
+AROUND_GREEN_YARDS = 30
+
+# Lower bucket edges per category: feet for putting, yards for the rest
+CATEGORY_BUCKETS = {
+    "Off the Tee": [0, 350, 400, 450, 500],
+    "Approach": [0, 100, 150, 200, 250],
+    "Around the Green": [0, 10, 20],
+    "Putting": [0, 3, 6, 10, 20, 40],
+}
+
+ROLLUP_COLUMNS = ["SG Category", "Distance Bucket"]
+
+
+def _bucket_labels(edges):
+    return [f"{lo}-{hi}" for lo, hi in zip(edges, edges[1:])] + [f"{edges[-1]}+"]
+
+
+def add_sg_categories(df):
+    """Return a copy of a stroke-trail table with ``SG Category`` and ``Distance Bucket``.
+
+    Putts are shots from the green, tee shots on par 4/5 are off the tee,
+    other shots within ``AROUND_GREEN_YARDS`` are around the green and
+    everything else (including par-3 tee shots) is approach. Shots without
+    a pin distance fall in the ``Unknown`` bucket.
+    """
+    out = df.copy()
+    lie = out["Lie"].fillna("").to_numpy(dtype=object)
+    par = pd.to_numeric(out["Par"], errors="coerce").to_numpy(dtype=float)
+    distance = pd.to_numeric(out["Pin Distance"], errors="coerce").to_numpy(dtype=float)
+    known = distance >= 0
+
+    putting = lie == "Green"
+    off_tee = (lie == "Tee") & (par != 3)
+    around = ~putting & ~off_tee & known & (distance <= AROUND_GREEN_YARDS)
+    category = np.select([putting, off_tee, around],
+                         ["Putting", "Off the Tee", "Around the Green"], default="Approach")
+
+    bucket = np.full(len(out), "Unknown", dtype=object)
+    for name, edges in CATEGORY_BUCKETS.items():
+        mask = (category == name) & known
+        idx = np.searchsorted(edges, distance[mask], side="right") - 1
+        bucket[mask] = np.asarray(_bucket_labels(edges), dtype=object)[idx]
+
+    out["SG Category"] = category
+    out["Distance Bucket"] = bucket
+    return out
+
+
+def category_rollup(scored, keys=()):
+    """Scored shots and total SG per ``keys`` x category x distance bucket.
+
+    ``scored`` comes from ``add_strokes_gained``. Shots whose SG could not
+    be computed are not counted.
+    """
+    by = list(keys) + ROLLUP_COLUMNS
+    grouped = add_sg_categories(scored).groupby(by, sort=True, dropna=False)["Strokes Gained"]
+    rollup = grouped.agg(["count", "sum"]).rename(
+        columns={"count": "Shots", "sum": "Strokes Gained"}).reset_index()
+    return rollup[rollup["Shots"] > 0].reset_index(drop=True)
+
+
+def category_table(rollup_rows, by, per_round=True):
+    """One row per ``by`` key and one column per category from ``query_rollups`` rows.
+
+    Values are strokes gained per round when ``per_round`` is set, else
+    totals; ``Total`` and ``Rounds`` columns are added.
+    """
+    df = pd.DataFrame(rollup_rows, columns=[*by, "category", "rounds", "shots", "strokes_gained"])
+    table = df.pivot_table(index=list(by), columns="category", values="strokes_gained",
+                           aggfunc="sum").reindex(columns=SG_CATEGORIES)
+    table.columns.name = None
+    rounds = df.groupby(list(by))["rounds"].max()
+    if per_round:
+        table = table.div(rounds, axis=0)
+    table["Total"] = table.sum(axis=1)
+    table["Rounds"] = rounds
+    return table
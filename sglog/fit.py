@@ -0,0 +1,142 @@
+"""Fitting expected-strokes baselines from our own shot archive.
+
+Every shot is labelled with its strokes remaining: the hole's last
+``Stroke`` minus the shot's own, plus one. Shots are binned by ``Pin
+Distance`` per ``Lie`` in one vectorized pass over the whole archive; each
+bin's mean is smoothed with its neighbours and made non-decreasing in
+distance with a weighted pool-adjacent-violators pass, and the bin centres
+become the anchors of a ``BaselineTable``. Lies with fewer than
+``MIN_LIE_SHOTS`` shots keep the tour anchors.
+
+Fits are saved as versioned JSON files read by ``baseline.load_baseline``,
+with one set of anchors for every round type and one for all rounds.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from sglog.baseline import ALL_SEGMENT, BASELINE_ANCHORS, LIES, MAX_DISTANCE
+from sglog.engine import HOLE_KEY_COLUMNS
+
+# Bin width per lie, in the lie's distance unit (feet on the green)
+BIN_WIDTHS = {"Green": 1}
+DEFAULT_BIN_WIDTH = 10
+
+# Fewest shots from a lie for it to be fitted
+MIN_LIE_SHOTS = 50
+
+# Strokes remaining at distance 0: a holed putt, or a tap-in from off the green
+ZERO_DISTANCE_STROKES = {"Green": 0.0}
+
+
+def strokes_remaining(df):
+    """Strokes taken from each shot to the end of its hole, including the shot."""
+    stroke = pd.to_numeric(df["Stroke"], errors="coerce")
+    last = stroke.groupby([df[col] for col in HOLE_KEY_COLUMNS], sort=False, dropna=False).transform("max")
+    return (last - stroke + 1).to_numpy(dtype=float)
+
+
+def _monotone(values, weights):
+    """Weighted least-squares non-decreasing fit (pool adjacent violators)."""
+    means, totals, sizes = [], [], []
+    for value, weight in zip(values, weights):
+        means.append(value)
+        totals.append(weight)
+        sizes.append(1)
+        while len(means) > 1 and means[-2] > means[-1]:
+            mean, total, size = means.pop(), totals.pop(), sizes.pop()
+            means[-1] = (means[-1] * totals[-1] + mean * total) / (totals[-1] + total)
+            totals[-1] += total
+            sizes[-1] += size
+    return np.repeat(means, sizes)
+
+
+def _fit_lie(lie, counts, remaining, distance):
+    """Anchors for one lie from its per-bin shot counts and sums."""
+    used = counts > 0
+    counts, remaining, distance = counts[used], remaining[used], distance[used]
+
+    # Count-weighted mean of each bin and its two neighbours, then monotone
+    kernel = np.ones(3)
+    smoothed = np.convolve(remaining, kernel, "same") / np.convolve(counts, kernel, "same")
+    strokes = _monotone(smoothed, counts)
+    centres = distance / counts
+
+    floor = ZERO_DISTANCE_STROKES.get(lie, 1.0)
+    strokes = np.maximum(strokes, floor)
+    if centres[0] > 0:
+        centres = np.concatenate([[0.0], centres])
+        strokes = np.concatenate([[floor], strokes])
+    return {
+        "distances": np.round(centres, 2).tolist(),
+        "strokes": np.round(strokes, 4).tolist(),
+        "shots": int(counts.sum()),
+    }
+
+
+def fit_baseline(df, min_shots=MIN_LIE_SHOTS):
+    """Anchors per lie fitted on every shot of a stroke-trail table.
+
+    Returns ``{lie: {"distances", "strokes", "shots"}}`` for every lie in
+    ``LIES``; lies with fewer than ``min_shots`` shots keep the tour anchors
+    and are marked ``"fitted": False``.
+    """
+    remaining = strokes_remaining(df)
+    distance = pd.to_numeric(df["Pin Distance"], errors="coerce").to_numpy(dtype=float)
+    code = pd.Categorical(df["Lie"], categories=LIES).codes
+    keep = (code >= 0) & (distance >= 0) & (remaining >= 1)
+    code, distance, remaining = code[keep], np.minimum(distance[keep], MAX_DISTANCE), remaining[keep]
+
+    # One bincount per statistic over (lie, bin) cells for the whole table
+    widths = np.array([BIN_WIDTHS.get(lie, DEFAULT_BIN_WIDTH) for lie in LIES])
+    bins = MAX_DISTANCE + 1
+    cell = code.astype(np.intp) * bins + (distance // widths[code]).astype(np.intp)
+    size = len(LIES) * bins
+    counts = np.bincount(cell, minlength=size).reshape(len(LIES), bins)
+    sums = np.bincount(cell, weights=remaining, minlength=size).reshape(len(LIES), bins)
+    spans = np.bincount(cell, weights=distance, minlength=size).reshape(len(LIES), bins)
+
+    fits = {}
+    for i, lie in enumerate(LIES):
+        shots = int(counts[i].sum())
+        if shots < min_shots:
+            tour_distances, tour_strokes = BASELINE_ANCHORS[lie]
+            fits[lie] = {"distances": list(tour_distances), "strokes": list(tour_strokes),
+                         "shots": shots, "fitted": False}
+        else:
+            fits[lie] = _fit_lie(lie, counts[i].astype(float), sums[i], spans[i])
+    return fits
+
+
+def fit_baselines(df, by="Round Type", min_shots=MIN_LIE_SHOTS):
+    """``fit_baseline`` on all rounds (``ALL_SEGMENT``) and on each value of ``by``."""
+    segments = {ALL_SEGMENT: fit_baseline(df, min_shots)}
+    if by is not None:
+        for value, group in df.groupby(by, sort=True):
+            segments[str(value)] = fit_baseline(group, min_shots)
+    return segments
+
+
+def save_baseline(path, segments):
+    """Write fitted ``segments`` as a baseline file and return its version.
+
+    The version is the fit date plus a hash of the anchors, so refitting
+    unchanged data gives the same version.
+    """
+    digest = hashlib.sha1(json.dumps(segments, sort_keys=True).encode()).hexdigest()[:8]
+    now = datetime.now(timezone.utc)
+    doc = {
+        "version": f"fit-{now:%Y%m%d}-{digest}",
+        "created": now.isoformat(timespec="seconds"),
+        "segments": {
+            name: {"shots": sum(fit["shots"] for fit in lies.values()), "lies": lies}
+            for name, lies in segments.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1)
+    return doc["version"]
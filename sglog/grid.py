@@ -0,0 +1,106 @@
+"""Tabular shot entry: one editable table per hole.
+
+The grid has a row per stroke and a column per shot field. Whatever the
+player types, the Step 3 conditional-field rules (Pin-High / On-Line,
+Foul Ball, Putt Break depending on lie and par) are applied afterwards in
+one vectorized pass over the table.
+"""
+
+import pandas as pd
+
+from sglog.core import (
+    BINARY_OPTIONS, FOUL_BALL_OPTIONS, LIE_OPTIONS, MISS_DIRECTIONS, PUTT_BREAKS,
+    SHOT_DEFAULTS, SHOT_FIELD_COLUMNS,
+)
+from sglog.model import Hole
+
+GRID_COLUMNS = list(SHOT_FIELD_COLUMNS)
+
+# Pin-High / On-Line are "", 1, 0 in the app; the grid edits them as text
+BINARY_LABELS = [str(opt) for opt in BINARY_OPTIONS]
+_BINARY_VALUES = dict(zip(BINARY_LABELS, BINARY_OPTIONS))
+
+# Grid column -> allowed values, for the editor's select columns
+GRID_OPTIONS = {
+    'Lie': LIE_OPTIONS,
+    'Miss Direction': MISS_DIRECTIONS,
+    'Pin-High': BINARY_LABELS,
+    'On-Line': BINARY_LABELS,
+    'Foul Ball': FOUL_BALL_OPTIONS,
+    'Putt Break': PUTT_BREAKS,
+}
+
+
+def hole_frame(hole, score, yardage):
+    """Grid rows for a hole: saved shots if ``hole`` is given, else defaults."""
+    rows = []
+    for i in range(score):
+        shot = hole[i] if hole is not None and i < len(hole) else None
+        row = {}
+        for col, field in SHOT_FIELD_COLUMNS.items():
+            default = SHOT_DEFAULTS[field]
+            if field == "PinDistance":
+                default = int(yardage) if i == 0 else -1
+            row[col] = shot.get(field, default) if shot is not None else default
+        rows.append(row)
+
+    frame = pd.DataFrame(rows, columns=GRID_COLUMNS, index=pd.RangeIndex(1, score + 1, name="Shot"))
+    for col in ('Pin-High', 'On-Line'):
+        frame[col] = frame[col].astype(str)
+    return frame
+
+
+def apply_edits(frame, editor_state):
+    """Apply ``st.data_editor`` state (``edited_rows``) to the frame it was given."""
+    frame = frame.copy()
+    for row, changes in (editor_state or {}).get("edited_rows", {}).items():
+        for col, val in changes.items():
+            frame.iloc[int(row), frame.columns.get_loc(col)] = val
+    return frame
+
+
+def apply_conditional_fields(frame, par):
+    """Clear fields that do not apply to each shot's lie and fill defaults.
+
+    Same rules as the Step 3 form: tee shots on par 3s and every non-green
+    shot after the tee record Pin-High / On-Line, tee shots on par 4/5
+    record Foul Ball, and putts record Putt Break.
+    """
+    frame = frame.copy()
+    # A cleared Lie cell is the form's default lie, and gets that lie's fields
+    frame['Lie'] = frame['Lie'].fillna(SHOT_DEFAULTS["Lie"])
+    lie = frame['Lie']
+    is_tee = lie.eq("Tee")
+    is_green = lie.eq("Green")
+    wants_pin_high = ~is_green & (~is_tee | (par == 3))
+    wants_foul_ball = is_tee & (par != 3)
+
+    for col, wanted in (('Pin-High', wants_pin_high), ('On-Line', wants_pin_high),
+                        ('Foul Ball', wants_foul_ball), ('Putt Break', is_green)):
+        field = SHOT_FIELD_COLUMNS[col]
+        default = str(SHOT_DEFAULTS[field]) if col in ('Pin-High', 'On-Line') else SHOT_DEFAULTS[field]
+        frame[col] = frame[col].where(wanted, None)
+        frame.loc[wanted & frame[col].isna(), col] = default
+
+    frame['Club'] = frame['Club'].fillna("")
+    frame['Miss Direction'] = frame['Miss Direction'].fillna("")
+    frame['Pin Distance'] = pd.to_numeric(frame['Pin Distance'], errors="coerce").fillna(-1)
+    return frame
+
+
+def frame_to_hole(frame, number, par, score, yardage=None, pin=None):
+    """``Hole`` from a grid, after ``apply_conditional_fields``."""
+    shot_dicts = []
+    for i, record in enumerate(frame.to_dict("records")):
+        shot = {"ShotNumber": i + 1}
+        for col, field in SHOT_FIELD_COLUMNS.items():
+            val = record[col]
+            if val is None or (isinstance(val, float) and pd.isna(val)):
+                continue
+            if col in ('Pin-High', 'On-Line'):
+                val = _BINARY_VALUES[val]
+            elif col == 'Pin Distance':
+                val = int(val) if float(val).is_integer() else float(val)
+            shot[field] = val
+        shot_dicts.append(shot)
+    return Hole.from_dicts(number, par, shot_dicts, score=score, yardage=yardage, pin=pin)
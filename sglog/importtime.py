@@ -0,0 +1,71 @@
+"""Import-time breakdown of the app's cold start.
+
+Runs a script (by default ``streamlit_app.py``, which Streamlit executes in
+bare mode when started with plain ``python``) under ``python -X importtime``
+in a fresh interpreter and totals the cost per top-level package. Heavy
+analytics dependencies are only meant to load once the export or analytics
+features are used, so finding one of them on the startup path is reported
+as a regression.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+# Packages that must not be imported before Step 4 / analytics are used
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow")
+
+DEFAULT_SCRIPT = Path(__file__).resolve().parent.parent / "streamlit_app.py"
+
+# One ``-X importtime`` line; times are in microseconds
+ImportRecord = namedtuple("ImportRecord", ["module", "depth", "self_us", "cumulative_us"])
+
+
+def parse_importtime(text):
+    """``ImportRecord`` for each ``import time:`` line of ``-X importtime`` output."""
+    records = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        module = name.rstrip().lstrip(" ")
+        depth = (len(name.rstrip()) - len(module) - 1) // 2
+        records.append(ImportRecord(module, depth, int(self_us), int(cumulative_us)))
+    return records
+
+
+def profile_script(path=DEFAULT_SCRIPT):
+    """Run ``path`` under ``-X importtime`` and return its ``ImportRecord`` list.
+
+    The script runs from its own directory against a throwaway round store,
+    so profiling never touches real data.
+    """
+    path = Path(path).resolve()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SGLOG_DB=os.path.join(tmp, "importtime.db"))
+        proc = subprocess.run([sys.executable, "-X", "importtime", str(path)],
+                              cwd=path.parent, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise OSError(f"{path.name} exited with status {proc.returncode}")
+    return parse_importtime(proc.stderr)
+
+
+def package_totals(records):
+    """Cumulative import time per top-level package, largest first, in microseconds."""
+    totals = {}
+    for record in records:
+        if record.depth == 0:
+            package = record.module.split(".")[0]
+            totals[package] = totals.get(package, 0) + record.cumulative_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def imported(records, modules):
+    """Which of ``modules`` (top-level names) appear anywhere in ``records``."""
+    loaded = {record.module.split(".")[0] for record in records}
+    return [name for name in modules if name in loaded]
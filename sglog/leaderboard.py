@@ -0,0 +1,168 @@
+"""Tournament leaderboard with strokes gained per player.
+
+A ``Leaderboard`` keeps one summary per stored round, or per round of each
+stroke-trail file, of a tournament and only scores what changed
+since its last refresh: stored rounds whose ``updated_at`` differs from the
+one it last scored, and files whose size or modification time
+changed. Changed files (one per player, as coaches export them) are scored
+across a process pool; new store rounds are scored together in one
+vectorized pass.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from sglog.engine import HOLE_KEY_COLUMNS, SG_CATEGORIES, add_sg_categories, add_strokes_gained
+
+SUMMARY_COLUMNS = ["Player", "Round", "Holes", "Strokes", "To Par", "SG Total", *SG_CATEGORIES]
+
+# Columns identifying one round of a tournament in a stroke-trail file
+FILE_ROUND_KEY = ["Player", "RndDate", "Round", "Round Type"]
+
+
+def _strokes_gained(df, baseline, hole_keys):
+    """``add_strokes_gained`` with ``baseline``, or per ``Round Type`` if it is a function of one."""
+    if not callable(baseline):
+        return add_strokes_gained(df, baseline, hole_keys)
+    round_type = df["Round Type"].astype("string").fillna("")
+    return pd.concat([add_strokes_gained(group, baseline(value), hole_keys)
+                      for value, group in df.groupby(round_type, sort=False)])
+
+
+def round_summaries(df, baseline=None, key=("Player", "Round")):
+    """Holes played, strokes, score to par and SG by category per ``key``.
+
+    ``baseline`` is a baseline table (default: tour) or a function from a
+    round type to one, as the app's ``get_baseline``. Rows come back keyed
+    by ``key`` and ``SUMMARY_COLUMNS``.
+    """
+    df = df[pd.to_numeric(df["Stroke"], errors="coerce").notna()]
+    if df.empty:
+        return []
+    key = list(key)
+    hole_keys = HOLE_KEY_COLUMNS + [col for col in key if col not in HOLE_KEY_COLUMNS]
+    scored = add_sg_categories(_strokes_gained(df, baseline, hole_keys))
+
+    sg = scored.pivot_table(index=key, columns="SG Category", values="Strokes Gained",
+                            aggfunc="sum").reindex(columns=SG_CATEGORIES).fillna(0.0)
+    holes = scored.drop_duplicates(key + ["Hole"]).groupby(key)
+    summary = pd.DataFrame({
+        "Holes": holes.size(),
+        "Strokes": scored.groupby(key).size(),
+        "Par": pd.to_numeric(holes["Par"].sum(), errors="coerce"),
+    })
+    summary["To Par"] = summary["Strokes"] - summary["Par"]
+    summary["SG Total"] = sg.sum(axis=1)
+    summary = summary.join(sg).reset_index()
+    return summary[key + [col for col in SUMMARY_COLUMNS if col not in key]].to_dict("records")
+
+
+def _score_file(args):
+    """Round summaries of one stroke-trail file, limited to a tournament (and round)."""
+    from sglog.stroke_trail import read_stroke_trail
+
+    path, tournament, round_number, baseline = args
+    df = read_stroke_trail(path)
+    keep = df["Tournament"].eq(tournament)
+    if round_number is not None:
+        keep &= df["Round"].eq(round_number)
+    return round_summaries(df[keep.fillna(False)], baseline, key=FILE_ROUND_KEY)
+
+
+class Leaderboard:
+    """Incrementally updated leaderboard of one tournament (optionally one round).
+
+    ``baseline`` is passed to ``round_summaries``; when scoring files across
+    processes it must be picklable.
+    """
+
+    def __init__(self, tournament, round_number=None, baseline=None):
+        self.tournament = tournament
+        self.round_number = round_number
+        self.baseline = baseline
+        self._rounds = {}      # round id, or (path, *FILE_ROUND_KEY values) -> summary
+        self._files = {}       # path -> ((mtime, size), [(path, ...), ...])
+        self._scored = {}      # round id -> updated_at when last scored
+
+    def refresh_store(self, store):
+        """Score the tournament's rounds saved since they were last scored.
+
+        Rounds no longer in the store (replaced by an import, say) are
+        dropped. Returns the number of rounds scored.
+        """
+        from sglog.stroke_trail import COLUMN_DTYPES
+
+        filters = {"tournament": self.tournament, "round_number": self.round_number}
+        rounds = store.query_rounds(**filters)
+        stored = {row["id"]: row["updated_at"] for row in rounds}
+        for round_id in set(self._scored) - set(stored):
+            del self._scored[round_id]
+            self._rounds.pop(round_id, None)
+        changed = {round_id for round_id, updated in stored.items() if self._scored.get(round_id) != updated}
+        if not changed:
+            return 0
+        since = min(stored[round_id] for round_id in changed)
+        rows = [row for row in store.query_shots(round_ids=True, updated_since=since, **filters)
+                if row["Round Id"] in changed]
+        for round_id in changed:
+            self._scored[round_id] = stored[round_id]
+            self._rounds.pop(round_id, None)
+        if rows:
+            # Keyed by round id: a player can have two stored rounds with the same number
+            summaries = round_summaries(pd.DataFrame(rows).astype(COLUMN_DTYPES), self.baseline,
+                                        key=["Round Id", "Player", "Round"])
+            self._rounds.update((summary.pop("Round Id"), summary) for summary in summaries)
+        return len(changed)
+
+    def refresh_files(self, paths, workers=None):
+        """Score stroke-trail files that are new or changed since the last refresh.
+
+        Files are scored across ``workers`` processes (default: CPU count);
+        rounds of files no longer in ``paths`` are dropped. Returns the number
+        of files scored.
+        """
+        paths = list(map(str, paths))
+        for path in set(self._files) - set(paths):
+            for key in self._files.pop(path)[1]:
+                del self._rounds[key]
+        changed = {}
+        for path in paths:
+            stat = os.stat(path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._files.get(path, (None,))[0] != signature:
+                changed[path] = signature
+        if not changed:
+            return 0
+
+        jobs = [(path, self.tournament, self.round_number, self.baseline) for path in changed]
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers == 1:
+            results = list(map(_score_file, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                results = list(pool.map(_score_file, jobs, chunksize=chunksize))
+
+        for (path, signature), summaries in zip(changed.items(), results):
+            for key in self._files.get(path, (None, []))[1]:
+                del self._rounds[key]
+            keyed = {(path, *(s[col] for col in FILE_ROUND_KEY)): s for s in summaries}
+            self._rounds.update(keyed)
+            self._files[path] = (signature, list(keyed))
+        return len(changed)
+
+    def table(self):
+        """Leaderboard rows per player, best score to par first, then most SG."""
+        columns = ["Pos", "Player", "Rounds", *SUMMARY_COLUMNS[2:]]
+        if not self._rounds:
+            return pd.DataFrame(columns=columns)
+        df = pd.DataFrame(list(self._rounds.values()))
+        board = df.groupby("Player").agg(
+            Rounds=("Round", "size"),
+            **{col: (col, "sum") for col in SUMMARY_COLUMNS[2:]},
+        ).reset_index()
+        board = board.sort_values(["To Par", "SG Total"], ascending=[True, False], kind="stable")
+        board["Pos"] = board["To Par"].rank(method="min").astype(int)
+        return board[columns].reset_index(drop=True)
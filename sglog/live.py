@@ -0,0 +1,93 @@
+"""Live strokes gained for the round being entered.
+
+Keeps, per hole, the expected strokes before each shot and each shot's SG,
+with running totals per hole and for the round. Changing one shot's lie or
+pin distance only changes its own expected value, so only that shot's SG
+and the SG of the shot before it are recomputed, and the totals move by the
+difference. Shots missing a lie or distance score ``NaN`` and count as 0 in
+the totals, as in ``engine.add_strokes_gained`` sums.
+"""
+
+from math import isnan
+
+from sglog.baseline import default_baseline
+
+
+def _value(sg):
+    return 0.0 if isnan(sg) else sg
+
+
+class LiveRoundSG:
+    """Per-shot SG and running totals, updated one shot at a time."""
+
+    __slots__ = ("_baseline", "_shots", "_expected", "_sg", "_hole_totals", "total")
+
+    def __init__(self, baseline=None):
+        self._baseline = baseline
+        self._shots = {}       # hole -> [(lie, distance), ...]
+        self._expected = {}    # hole -> expected strokes before each shot
+        self._sg = {}          # hole -> SG of each shot
+        self._hole_totals = {}
+        self.total = 0.0
+
+    @property
+    def baseline(self):
+        return default_baseline() if self._baseline is None else self._baseline
+
+    def _shot_sg(self, number, i):
+        expected = self._expected[number]
+        after = expected[i + 1] if i + 1 < len(expected) else 0.0
+        return expected[i] - after - 1.0
+
+    def _set_sg(self, number, i, sg):
+        delta = _value(sg) - _value(self._sg[number][i])
+        self._sg[number][i] = sg
+        self._hole_totals[number] += delta
+        self.total += delta
+
+    def set_hole(self, number, hole):
+        """Score every shot of ``hole`` (a ``Hole``), replacing what was there."""
+        self.remove_hole(number)
+        shots = [(shot.lie, shot.pin_distance) for shot in hole]
+        baseline = self.baseline
+        self._shots[number] = shots
+        self._expected[number] = [baseline.expected(lie, distance) for lie, distance in shots]
+        self._sg[number] = [self._shot_sg(number, i) for i in range(len(shots))]
+        self._hole_totals[number] = sum(_value(sg) for sg in self._sg[number])
+        self.total += self._hole_totals[number]
+
+    def remove_hole(self, number):
+        """Forget a hole and take its SG out of the round total."""
+        if number in self._shots:
+            self.total -= self._hole_totals.pop(number)
+            del self._shots[number], self._expected[number], self._sg[number]
+
+    def update_shot(self, number, i, lie, distance):
+        """Change shot ``i`` (0-based) of a scored hole and rescore the affected pair."""
+        if self._shots[number][i] == (lie, distance):
+            return
+        self._shots[number][i] = (lie, distance)
+        self._expected[number][i] = self.baseline.expected(lie, distance)
+        for j in (i - 1, i):
+            if j >= 0:
+                self._set_sg(number, j, self._shot_sg(number, j))
+
+    def update_hole(self, number, hole):
+        """Bring a hole up to date with ``hole``, rescoring only the shots that changed.
+
+        A hole that was not scored yet, or whose number of shots changed, is
+        scored in full.
+        """
+        if number not in self._shots or len(self._shots[number]) != len(hole):
+            self.set_hole(number, hole)
+            return
+        for i, shot in enumerate(hole):
+            self.update_shot(number, i, shot.lie, shot.pin_distance)
+
+    def hole_total(self, number):
+        """SG of a hole so far (0 for a hole that was not scored)."""
+        return self._hole_totals.get(number, 0.0)
+
+    def shot_sg(self, number):
+        """SG of each shot of a hole, in stroke order."""
+        return list(self._sg.get(number, ()))
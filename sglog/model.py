@@ -0,0 +1,219 @@
+"""Compact Shot / Hole / Round records.
+
+A ``Hole`` stores its shots column-wise: clubs in a list, pin distances in a
+``double`` array and every option field (lie, miss direction, pin-high,
+on-line, foul ball, putt break) as a one-byte index into its option list,
+with ``-1`` for "not recorded". ``Shot`` is a slotted record used to read
+and write one row, and ``Shot.from_state`` is the only place where Step 3
+widget values are turned into a record.
+"""
+
+from array import array
+from math import isnan
+
+from sglog.core import (
+    BINARY_OPTIONS, FOUL_BALL_OPTIONS, LIE_OPTIONS, MISS_DIRECTIONS, PIN_DISTANCE_LIMITS, PUTT_BREAKS,
+    SHOT_DEFAULTS, build_export_rows, conditional_fields, round_info, shot_key,
+)
+
+# Option-valued shot fields, in storage order, with their allowed values
+OPTION_FIELDS = {
+    "Lie": LIE_OPTIONS,
+    "MissDirection": MISS_DIRECTIONS,
+    "PinHigh": BINARY_OPTIONS,
+    "OnLine": BINARY_OPTIONS,
+    "FoulBall": FOUL_BALL_OPTIONS,
+    "PuttBreak": PUTT_BREAKS,
+}
+_OPTION_CODES = {field: {opt: code for code, opt in enumerate(options)}
+                 for field, options in OPTION_FIELDS.items()}
+_N_OPTIONS = len(OPTION_FIELDS)
+
+# Shot dict key -> Shot attribute
+SHOT_ATTRS = {
+    "ShotNumber": "number",
+    "Club": "club",
+    "Lie": "lie",
+    "PinDistance": "pin_distance",
+    "MissDirection": "miss_direction",
+    "PinHigh": "pin_high",
+    "OnLine": "on_line",
+    "FoulBall": "foul_ball",
+    "PuttBreak": "putt_break",
+}
+
+
+class Shot:
+    """One stroke. Fields that were not recorded are ``None``."""
+
+    __slots__ = tuple(SHOT_ATTRS.values())
+
+    def __init__(self, number, club=None, lie=None, pin_distance=None, miss_direction=None,
+                 pin_high=None, on_line=None, foul_ball=None, putt_break=None):
+        self.number = number
+        self.club = club
+        self.lie = lie
+        self.pin_distance = pin_distance
+        self.miss_direction = miss_direction
+        self.pin_high = pin_high
+        self.on_line = on_line
+        self.foul_ball = foul_ball
+        self.putt_break = putt_break
+
+    @classmethod
+    def from_state(cls, state, hole, number, par):
+        """Read shot ``number`` of ``hole`` from the Step 3 widget values."""
+        values = {field: state.get(shot_key(field, hole, number), SHOT_DEFAULTS[field])
+                  for field in ("Club", "Lie", "PinDistance", "MissDirection")}
+        for field in conditional_fields(values["Lie"], par):
+            values[field] = state.get(shot_key(field, hole, number), SHOT_DEFAULTS[field])
+        return cls.from_dict(values, number=number)
+
+    @classmethod
+    def from_dict(cls, shot_dict, number=None):
+        """Build from a shot dict (``ShotNumber``, ``Club``, ``Lie``, ...)."""
+        shot = cls(shot_dict.get("ShotNumber", number))
+        for key, attr in SHOT_ATTRS.items():
+            if key != "ShotNumber" and key in shot_dict:
+                setattr(shot, attr, shot_dict[key])
+        return shot
+
+    def as_dict(self):
+        """Shot dict with only the recorded fields, as used for export and storage."""
+        shot_dict = {}
+        for key, attr in SHOT_ATTRS.items():
+            val = getattr(self, attr)
+            if val is not None:
+                shot_dict[key] = val
+        return shot_dict
+
+    def get(self, key, default=None):
+        """Value of a shot dict key, or ``default`` if it was not recorded."""
+        val = getattr(self, SHOT_ATTRS[key])
+        return default if val is None else val
+
+    def __eq__(self, other):
+        if not isinstance(other, Shot):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self):
+        return f"Shot({', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())})"
+
+
+class Hole:
+    """One hole's info and its shots, stored column-wise."""
+
+    __slots__ = ("number", "par", "score", "yardage", "pin", "_clubs", "_distances", "_codes")
+
+    def __init__(self, number, par, score, yardage=None, pin=None):
+        self.number = number
+        self.par = par
+        self.score = score
+        self.yardage = yardage
+        self.pin = pin
+        self._clubs = [None] * score
+        self._distances = array("d", [float("nan")]) * score
+        self._codes = array("b", [-1]) * (score * _N_OPTIONS)
+
+    @classmethod
+    def from_state(cls, state, number, par, score, yardage=None, pin=None):
+        """Read every shot of a hole from the Step 3 widget values."""
+        hole = cls(number, par, score, yardage, pin)
+        for i in range(score):
+            hole[i] = Shot.from_state(state, number, i + 1, par)
+        return hole
+
+    @classmethod
+    def from_dicts(cls, number, par, shot_dicts, score=None, yardage=None, pin=None):
+        """Build from a list of shot dicts (store and CSV import)."""
+        hole = cls(number, par, len(shot_dicts) if score is None else score, yardage, pin)
+        for i, shot_dict in enumerate(shot_dicts[:hole.score]):
+            hole[i] = Shot.from_dict(shot_dict, number=i + 1)
+        return hole
+
+    def __len__(self):
+        return self.score
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.score:
+            raise IndexError(f"hole {self.number} has {self.score} shots")
+        distance = self._distances[i]
+        shot = Shot(i + 1, club=self._clubs[i],
+                    pin_distance=None if isnan(distance) else _number(distance))
+        base = i * _N_OPTIONS
+        for offset, (key, options) in enumerate(OPTION_FIELDS.items()):
+            code = self._codes[base + offset]
+            if code >= 0:
+                setattr(shot, SHOT_ATTRS[key], options[code])
+        return shot
+
+    def __setitem__(self, i, shot):
+        if not 0 <= i < self.score:
+            raise IndexError(f"hole {self.number} has {self.score} shots")
+        self._clubs[i] = shot.club
+        self._distances[i] = float("nan") if shot.pin_distance is None else float(shot.pin_distance)
+        base = i * _N_OPTIONS
+        for offset, key in enumerate(OPTION_FIELDS):
+            val = getattr(shot, SHOT_ATTRS[key])
+            if val is None:
+                self._codes[base + offset] = -1
+            elif val in _OPTION_CODES[key]:
+                self._codes[base + offset] = _OPTION_CODES[key][val]
+            else:
+                raise ValueError(f"{val!r} is not a valid {key}")
+
+    def __iter__(self):
+        return (self[i] for i in range(self.score))
+
+    def as_dicts(self):
+        """Shot dicts for every stroke of the hole."""
+        return [shot.as_dict() for shot in self]
+
+
+def scrub_shot(shot_dict):
+    """Fix a shot dict in place so every value fits the Step 3 inputs.
+
+    Option values that are not one of the field's options and pin distances
+    outside ``PIN_DISTANCE_LIMITS`` are dropped; fractional pin distances are
+    rounded. Returns a ``(rule, description)`` pair per change.
+    """
+    changes = []
+    for key, codes in _OPTION_CODES.items():
+        if key in shot_dict and shot_dict[key] not in codes:
+            changes.append(("unknown_option", f"{shot_dict.pop(key)!r} is not a valid {key}; left blank"))
+    distance = shot_dict.get("PinDistance")
+    low, high = PIN_DISTANCE_LIMITS
+    if distance is not None and not low <= distance <= high:
+        changes.append(("pin_distance_range",
+                        f"Pin Distance {shot_dict.pop('PinDistance')!r} is outside {low} to {high}; left blank"))
+    elif distance is not None and distance != round(distance):
+        shot_dict["PinDistance"] = round(distance)
+        changes.append(("pin_distance_fraction",
+                        f"Pin Distance {distance!r} rounded to {shot_dict['PinDistance']}"))
+    return changes
+
+
+class Round:
+    """A round's Step 1 info and its holes, keyed by hole number."""
+
+    __slots__ = ("info", "holes")
+
+    def __init__(self, info, holes):
+        self.info = info
+        self.holes = holes
+
+    @classmethod
+    def from_session(cls, state):
+        """Round from the app's session state (Step 1 keys and ``shot_data``)."""
+        return cls(round_info(state), dict(state.get("shot_data", {})))
+
+    def export_rows(self, hole_table, holes):
+        """Stroke-trail rows for ``holes`` (see ``core.build_export_rows``)."""
+        shot_data = {number: hole.as_dicts() for number, hole in self.holes.items()}
+        return build_export_rows(self.info, hole_table, shot_data, holes)
+
+
+def _number(value):
+    """400.0 -> 400, so integer pin distances round-trip as ints."""
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,147 @@
+"""Opt-in per-rerun timing of the app's sections.
+
+A ``RerunProfile`` is created at the top of every script run. The app marks
+where each step starts with ``lap`` and wraps smaller spans with ``section``
+(the export frame) or ``timed`` (fragments, which also rerun on their own and
+then get a profile with their own run id). Each finished span records its
+wall time and the number of widgets it registered, and is appended as one
+JSON line to a rotating log so real sessions can be profiled in production.
+
+When the profile is disabled every call returns immediately.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+PROFILE_LOG_PATH = os.environ.get("SGLOG_PROFILE_LOG", "sglog_profile.log")
+PROFILE_LOG_BYTES = 1_000_000
+PROFILE_LOG_BACKUPS = 3
+
+
+def profiling_requested(query_params=None):
+    """Whether ``SGLOG_PROFILE=1`` is set or the page was opened with ``?profile=1``."""
+    if os.environ.get("SGLOG_PROFILE", "") not in ("", "0"):
+        return True
+    return (query_params or {}).get("profile", "0") not in ("", "0")
+
+
+def profile_logger(path=PROFILE_LOG_PATH):
+    """Logger writing to ``path``, rotated at ``PROFILE_LOG_BYTES``."""
+    logger = logging.getLogger("sglog.profile")
+    if not logger.handlers:
+        handler = RotatingFileHandler(path, maxBytes=PROFILE_LOG_BYTES,
+                                      backupCount=PROFILE_LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def script_widget_count():
+    """Widgets registered so far in the current Streamlit script run."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return 0
+    # Newer Streamlit keeps per-run state on ``ctx.shared``
+    ids = getattr(ctx, "shared", ctx).widget_ids_this_run
+    return len(ids.snapshot() if hasattr(ids, "snapshot") else ids)
+
+
+def fragment_rerun():
+    """Whether the current Streamlit script run reruns fragments only."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and getattr(ctx, "fragment_ids_this_run", None))
+
+
+class RerunProfile:
+    """Section timings and widget counts for one script run."""
+
+    __slots__ = ("enabled", "run_id", "records", "_widget_count", "_logger", "_lap")
+
+    def __init__(self, enabled=False, widget_count=script_widget_count, logger=None):
+        self.enabled = enabled
+        self.run_id = uuid.uuid4().hex[:8]
+        self.records = []
+        self._widget_count = widget_count
+        self._logger = logger
+        self._lap = None
+
+    def fork(self):
+        """A new profile with the same settings and its own run id, e.g. for a fragment rerun."""
+        return RerunProfile(self.enabled, self._widget_count, self._logger)
+
+    def _start(self, name):
+        return name, time.perf_counter(), self._widget_count()
+
+    def _stop(self, started):
+        name, start, widgets = started
+        record = {
+            "run": self.run_id,
+            "section": name,
+            "ms": round((time.perf_counter() - start) * 1000, 2),
+            "widgets": self._widget_count() - widgets,
+        }
+        self.records.append(record)
+        if self._logger is not None:
+            self._logger.info(json.dumps(record))
+
+    def lap(self, name):
+        """End the current top-level section, if any, and start ``name``."""
+        if not self.enabled:
+            return
+        if self._lap is not None:
+            self._stop(self._lap)
+        self._lap = self._start(name)
+
+    def finish(self):
+        """End the current top-level section; call once at the end of the script."""
+        if self.enabled and self._lap is not None:
+            self._stop(self._lap)
+            self._lap = None
+
+    def note(self, name, **fields):
+        """Log a record of other per-run figures, e.g. session size."""
+        if self.enabled and self._logger is not None:
+            self._logger.info(json.dumps({"run": self.run_id, "section": name, **fields}))
+
+    @contextmanager
+    def section(self, name):
+        """Time the ``with`` block as section ``name``."""
+        if not self.enabled:
+            yield
+            return
+        started = self._start(name)
+        try:
+            yield
+        finally:
+            self._stop(started)
+
+
+def timed(name, current, fragment_rerun=fragment_rerun):
+    """Decorator timing every call of a fragment as ``name`` in the profile ``current()`` returns.
+
+    Streamlit reruns a fragment with the function from the run that defined
+    it, so the profile is looked up per call instead of bound here. A call
+    in a fragment-only rerun is timed in a ``fork`` of it with its own run id.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = current()
+            if fragment_rerun():
+                profile = profile.fork()
+            with profile.section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,124 @@
+"""Scorecard rendering.
+
+Score-to-par classes for a whole card are computed in one NumPy pass and the
+resulting HTML is memoized on the card contents in shared caches, so
+redrawing an unchanged scorecard costs a dict lookup in any session. Cards
+for several rounds can be stacked into one tournament view from the same
+cached pieces.
+"""
+
+import numpy as np
+
+from sglog.cache import shared_cache
+
+from sglog.core import format_to_par
+
+# Indexed by score - par + 2, clamped to the ends
+SCORE_CLASSES = ("eagle", "birdie", "par", "bogey", "double")
+
+SCORECARD_CSS = """
+<style>
+    table.custom-table {
+        width: 100%;
+        border-collapse: collapse;
+        margin-top: 1rem;
+    }
+    table.custom-table th, table.custom-table td {
+        padding: 6px 10px;
+        text-align: center;
+        border: 1px solid #ccc;
+    }
+    .score-box {
+        display: inline-block;
+        width: 35px;
+        height: 35px;
+        line-height: 35px;
+        text-align: center;
+        font-weight: bold;
+    }
+    .score-box.eagle { border-radius: 50%; border: 4px double green; background-color: black; }
+    .score-box.birdie { border-radius: 50%; border: 2px solid green; background-color: black; }
+    .score-box.bogey { border: 2px solid red; background-color: black; }
+    .score-box.double { border: 4px solid red; background-color: black; }
+</style>
+"""
+
+
+def score_classes(scores, pars):
+    """Classes for arrays of hole scores and pars, in one vectorized pass."""
+    idx = np.clip(np.asarray(scores, dtype=int) - np.asarray(pars, dtype=int) + 2, 0, 4)
+    return np.asarray(SCORE_CLASSES, dtype=object)[idx]
+
+
+def _card_key(hole_table):
+    return (tuple(hole_table["Hole"]), tuple(hole_table["Par"]), tuple(hole_table["Score"]))
+
+
+def _compute_card_rows(holes, pars, scores):
+    classes = score_classes(scores, pars)
+    hole_row = "".join(f"<td>{hole}</td>" for hole in holes)
+    par_row = "".join(f"<td>{par}</td>" for par in pars)
+    score_row = "".join(
+        f"<td><div class='score-box {cls}'>{score}</div></td>" for score, cls in zip(scores, classes)
+    )
+    total_score = sum(scores)
+    return hole_row, par_row, score_row, total_score, format_to_par(total_score, sum(pars))
+
+
+def _card_rows(holes, pars, scores):
+    """Hole, Par and Score rows plus (total score, to-par string) for one card."""
+    return shared_cache("scorecard rows").get_or_compute(
+        (holes, pars, scores), lambda: _compute_card_rows(holes, pars, scores))
+
+
+def _compute_card_html(holes, pars, scores):
+    hole_row, par_row, score_row, total_score, diff_str = _card_rows(holes, pars, scores)
+    return "".join([
+        SCORECARD_CSS,
+        "<table class='custom-table'><tbody>",
+        f"<tr><th>Hole</th>{hole_row}</tr>",
+        f"<tr><th>Par</th>{par_row}</tr>",
+        f"<tr><th>Score</th>{score_row}</tr>",
+        "<tr><th style='text-align: center; font-weight: bold;'>Total</th>",
+        f"<td colspan='{len(holes)}' style='text-align: center; font-weight: bold;'>{total_score}</td>",
+        f"<td style='text-align: center; font-weight: bold;'>{total_score} ({diff_str})</td></tr>",
+        "</tbody></table>",
+    ])
+
+
+def scorecard_html(hole_table):
+    """Scorecard table for one round's ``hole_table``, memoized on its contents."""
+    key = _card_key(hole_table)
+    return shared_cache("scorecard").get_or_compute(key, lambda: _compute_card_html(*key))
+
+
+def multi_round_html(rounds):
+    """One table with a Score row per round, e.g. for a whole tournament.
+
+    ``rounds`` is a list of ``(label, hole_table)`` pairs played on the same
+    holes; the Hole and Par rows are taken from the first round.
+    """
+    if not rounds:
+        return ""
+
+    keys = [_card_key(hole_table) for _, hole_table in rounds]
+    hole_row, par_row = _card_rows(*keys[0])[:2]
+    parts = [
+        SCORECARD_CSS,
+        "<table class='custom-table'><tbody>",
+        f"<tr><th>Hole</th>{hole_row}<th>Total</th></tr>",
+        f"<tr><th>Par</th>{par_row}<th>{sum(keys[0][1])}</th></tr>",
+    ]
+    grand_total = 0
+    for (label, _), key in zip(rounds, keys):
+        _, _, score_row, total_score, diff_str = _card_rows(*key)
+        grand_total += total_score
+        parts.append(f"<tr><th>{label}</th>{score_row}<th>{total_score} ({diff_str})</th></tr>")
+
+    total_par = sum(sum(key[1]) for key in keys)
+    parts.append(
+        f"<tr><th>Total</th><td colspan='{len(keys[0][0])}'></td>"
+        f"<th>{grand_total} ({format_to_par(grand_total, total_par)})</th></tr>"
+    )
+    parts.append("</tbody></table>")
+    return "".join(parts)
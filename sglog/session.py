@@ -0,0 +1,64 @@
+"""Session-state housekeeping for the app.
+
+The canonical copy of a round is ``hole_table`` (Step 2) plus ``shot_data``
+(``Hole`` records per saved hole). Widget keys only mirror those values while
+their widgets are on screen, so keys for holes that are not being edited can
+be dropped and are rebuilt from the canonical copy the next time a hole is
+shown. Nothing here imports Streamlit; the helpers take any mapping of
+session keys.
+"""
+
+from sglog.cache import approx_size, shared_ids
+from sglog.core import SHOT_KEY_PREFIXES
+
+# Step 2 hole-info widgets, e.g. ``par_3``
+HOLE_INFO_PREFIXES = ("par", "score", "yardage", "pin")
+
+# Step 3 widgets: per-shot ``lie_3_2`` and per-hole grid editor ``grid_3``
+SHOT_PREFIXES = tuple(SHOT_KEY_PREFIXES.values())
+GRID_PREFIX = "grid"
+
+
+def _hole_of(key):
+    """(prefix, hole) of a per-hole or per-shot widget key, else ``None``."""
+    parts = key.split("_")
+    if len(parts) == 3 and parts[0] in SHOT_PREFIXES and parts[1].isdigit() and parts[2].isdigit():
+        return parts[0], int(parts[1])
+    if len(parts) == 2 and parts[1].isdigit() and (parts[0] in HOLE_INFO_PREFIXES
+                                                   or parts[0] == GRID_PREFIX):
+        return parts[0], int(parts[1])
+    return None
+
+
+def stale_widget_keys(keys, keep_hole=None, num_holes=None):
+    """Widget keys that can be dropped without losing data.
+
+    Shot and grid keys are stale for every hole except ``keep_hole`` (all of
+    them when it is ``None``); hole-info keys are stale for holes beyond
+    ``num_holes`` (all of them when it is ``None``).
+    """
+    stale = []
+    for key in keys:
+        parsed = _hole_of(key)
+        if parsed is None:
+            continue
+        prefix, hole = parsed
+        if prefix in HOLE_INFO_PREFIXES:
+            if num_holes is None or hole > num_holes:
+                stale.append(key)
+        elif hole != keep_hole:
+            stale.append(key)
+    return stale
+
+
+def session_sizes(state):
+    """Serialized size in bytes of every session-state value, largest first.
+
+    A pickle is a close, cheap proxy for what a session holds on the
+    server; it counts objects shared between keys (``hole_table`` /
+    ``all_hole_data``) once per key. Objects shared between sessions, such
+    as the baseline table ``live_sg`` scores against, are not counted.
+    """
+    exclude = shared_ids()
+    sizes = {key: approx_size(state[key], exclude) for key in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,227 @@
+"""Monte Carlo what-if rounds from logged shot outcomes.
+
+Every logged shot becomes one outcome sample of its state, the ``Lie`` plus
+a ``Pin Distance`` bucket: the lie of the next shot, or holed, and the next
+distance as a ratio of the current one. Samples are pooled per player and
+for the whole team. A state with fewer than ``MIN_SAMPLES`` samples for the
+player borrows the team's pool, and an empty team state the nearest bucket
+of the same lie.
+
+Simulated holes are played in lockstep: every step draws one outcome for
+each hole still being played with a single batched sample. Shots whose
+strokes-gained category (``engine.add_sg_categories`` rules) is in
+``team_categories`` draw from the team pool instead, which answers "what if
+this player's approach play matched the team's?". Independent batches of
+rounds run across a process pool with their own random streams.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from sglog.baseline import LIES
+from sglog.engine import AROUND_GREEN_YARDS, HOLE_KEY_COLUMNS, SG_CATEGORIES
+
+# Distance bucket width per lie (feet on the green) and buckets per lie
+BUCKET_WIDTHS = {"Green": 3}
+DEFAULT_BUCKET_WIDTH = 20
+NUM_BUCKETS = 40
+
+# Fewest samples for a player's own state to be used
+MIN_SAMPLES = 10
+
+# Lie whose samples stand in for lies with none logged
+FALLBACK_LIE = "Rough"
+
+# Strokes after which a simulated hole is picked up
+MAX_STROKES = 15
+
+# Rounds per process-pool batch
+BATCH_ROUNDS = 10_000
+
+HOLED = len(LIES)
+TEAM = "Team"
+
+ShotModel = namedtuple("ShotModel", ["players", "start", "count", "next_lie", "ratio"])
+ShotModel.__doc__ = """Outcome samples by (pool, state); pool 0 is the team, then one per player.
+
+``start``/``count`` index each (pool, state) into the ``next_lie``/``ratio``
+sample arrays, with fallbacks already resolved.
+"""
+
+_WIDTHS = np.array([BUCKET_WIDTHS.get(lie, DEFAULT_BUCKET_WIDTH) for lie in LIES], dtype=float)
+_TEE, _GREEN = LIES.index("Tee"), LIES.index("Green")
+
+
+def _states(lie, distance):
+    """State number of (lie code, distance) arrays."""
+    bucket = np.minimum(distance // _WIDTHS[lie], NUM_BUCKETS - 1).astype(np.intp)
+    return lie * NUM_BUCKETS + bucket
+
+
+def _nearest_filled(count):
+    """For each state, the nearest state of the same lie with samples (-1 if none)."""
+    nearest = np.full(count.shape, -1, dtype=np.intp)
+    for lie in range(len(LIES)):
+        states = np.arange(lie * NUM_BUCKETS, (lie + 1) * NUM_BUCKETS)
+        filled = states[count[states] > 0]
+        if len(filled):
+            pos = np.searchsorted(filled, states)
+            lower = filled[np.maximum(pos - 1, 0)]
+            upper = filled[np.minimum(pos, len(filled) - 1)]
+            nearest[states] = np.where(states - lower <= np.abs(upper - states), lower, upper)
+    return nearest
+
+
+def build_shot_model(df, min_samples=MIN_SAMPLES):
+    """Outcome samples of every player in a stroke-trail table.
+
+    Shots need a known lie and pin distance; the last shot of a hole is
+    holed. A shot followed by one without a lie or distance is skipped.
+    """
+    stroke = pd.to_numeric(df["Stroke"], errors="coerce").to_numpy(dtype=float)
+    distance = pd.to_numeric(df["Pin Distance"], errors="coerce").to_numpy(dtype=float)
+    lie = pd.Categorical(df["Lie"], categories=LIES).codes.astype(np.intp)
+    hole_id = df.groupby(HOLE_KEY_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+    player_codes, players = pd.factorize(df["Player"].astype("string").fillna(""), sort=True)
+
+    order = np.lexsort((stroke, hole_id))
+    order = order[~np.isnan(stroke[order])]
+    lie, distance, hole_id, player = lie[order], distance[order], hole_id[order], player_codes[order]
+
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = hole_id[1:] != hole_id[:-1]
+    next_lie = np.full(len(order), HOLED, dtype=np.intp)
+    next_lie[:-1] = np.where(last[:-1], HOLED, lie[1:])
+    next_distance = np.zeros(len(order))
+    next_distance[:-1] = np.where(last[:-1], 0.0, distance[1:])
+
+    known = (lie >= 0) & (distance >= 0)
+    usable = known & ((next_lie == HOLED) | ((next_lie >= 0) & (next_distance >= 0)))
+    lie, distance, player = lie[usable], distance[usable], player[usable]
+    next_lie, next_distance = next_lie[usable], next_distance[usable]
+    ratio = next_distance / np.maximum(distance, 1.0)
+
+    # Samples sorted by (pool, state): the team pool holds every sample and
+    # each player's pool their own
+    num_states = len(LIES) * NUM_BUCKETS
+    state = _states(lie, distance)
+    pools = np.concatenate([np.zeros(len(state), dtype=np.intp), player + 1])
+    keys = pools * num_states + np.tile(state, 2)
+    by_key = np.argsort(keys, kind="stable")
+    sample = np.tile(np.arange(len(state)), 2)[by_key]
+    count = np.bincount(keys, minlength=(len(players) + 1) * num_states).reshape(-1, num_states)
+    start = (np.cumsum(count.ravel()) - count.ravel()).reshape(count.shape)
+
+    # Team states without samples borrow the nearest bucket of the lie, then
+    # thin player states borrow the team's
+    nearest = _nearest_filled(count[0])
+    fill = nearest >= 0
+    start[0, fill], count[0, fill] = start[0, nearest[fill]], count[0, nearest[fill]]
+    # Lies never logged (usually Other) play like the rough
+    unseen = np.flatnonzero(count[0] == 0)
+    stand_in = LIES.index(FALLBACK_LIE) * NUM_BUCKETS + unseen % NUM_BUCKETS
+    if (count[0, stand_in] == 0).any():
+        raise ValueError(f"not enough logged shots to simulate (need Tee, Green and {FALLBACK_LIE})")
+    start[0, unseen], count[0, unseen] = start[0, stand_in], count[0, stand_in]
+    thin = count[1:] < min_samples
+    start[1:][thin] = np.broadcast_to(start[0], thin.shape)[thin]
+    count[1:][thin] = np.broadcast_to(count[0], thin.shape)[thin]
+
+    return ShotModel(
+        players=(TEAM, *map(str, players)),
+        start=start,
+        count=count,
+        next_lie=next_lie[sample].astype(np.int8),
+        ratio=ratio[sample].astype(np.float32),
+    )
+
+
+def _categories(lie, distance, par):
+    """Index into ``SG_CATEGORIES`` of each simulated shot."""
+    putting = lie == _GREEN
+    off_tee = (lie == _TEE) & (par != 3)
+    around = ~putting & ~off_tee & (distance <= AROUND_GREEN_YARDS)
+    return np.select([off_tee, around, putting], [SG_CATEGORIES.index(name) for name in
+                     ("Off the Tee", "Around the Green", "Putting")], default=SG_CATEGORIES.index("Approach"))
+
+
+def play_rounds(model, pool, pars, yardages, rounds, team_categories=(), seed=None):
+    """Scores of ``rounds`` simulated rounds of ``pool`` on holes ``pars``/``yardages``.
+
+    Returns an ``(rounds, holes)`` array of strokes per hole.
+    """
+    rng = np.random.default_rng(seed)
+    pars = np.tile(np.asarray(pars, dtype=np.int8), rounds)
+    lie = np.full(len(pars), _TEE, dtype=np.intp)
+    distance = np.tile(np.asarray(yardages, dtype=float), rounds)
+    strokes = np.zeros(len(pars), dtype=np.int8)
+    swap = np.isin(np.arange(len(SG_CATEGORIES)),
+                   [SG_CATEGORIES.index(name) for name in team_categories])
+
+    playing = np.arange(len(pars))
+    for _ in range(MAX_STROKES):
+        if not len(playing):
+            break
+        cur_lie, cur_distance = lie[playing], distance[playing]
+        state = _states(cur_lie, cur_distance)
+        pools = np.where(swap[_categories(cur_lie, cur_distance, pars[playing])], 0, pool)
+        draw = (rng.random(len(playing)) * model.count[pools, state]).astype(np.intp)
+        sample = model.start[pools, state] + draw
+
+        strokes[playing] += 1
+        lie[playing] = model.next_lie[sample]
+        distance[playing] = cur_distance * model.ratio[sample]
+        playing = playing[lie[playing] != HOLED]
+
+    return strokes.reshape(rounds, -1)
+
+
+def _play_batch(args):
+    return play_rounds(*args)
+
+
+def simulate(model, player, pars, yardages, rounds=100_000, team_categories=(), seed=None,
+             workers=None, batch_rounds=BATCH_ROUNDS):
+    """Strokes per hole of ``rounds`` simulated rounds of ``player``.
+
+    Rounds are split into batches of ``batch_rounds``, each with its own
+    random stream spawned from ``seed``, and played across ``workers``
+    processes (default: CPU count). Results do not depend on ``workers``.
+    """
+    if player not in model.players:
+        raise ValueError(f"no logged shots for {player!r}")
+    unknown = set(team_categories) - set(SG_CATEGORIES)
+    if unknown:
+        raise ValueError(f"unknown categories: {', '.join(sorted(unknown))}")
+
+    pool = model.players.index(player)
+    sizes = [batch_rounds] * (rounds // batch_rounds) + ([rounds % batch_rounds] if rounds % batch_rounds else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(model, pool, pars, yardages, size, tuple(team_categories), s) for size, s in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        results = list(map(_play_batch, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool_executor:
+            results = list(pool_executor.map(_play_batch, jobs))
+    return np.concatenate(results)
+
+
+def score_summary(strokes, pars):
+    """Mean, spread and percentiles of simulated round scores and to par."""
+    totals = strokes.sum(axis=1)
+    p10, p50, p90 = np.percentile(totals, [10, 50, 90])
+    return {
+        "rounds": len(totals),
+        "mean": float(totals.mean()),
+        "to_par": float(totals.mean() - sum(pars)),
+        "std": float(totals.std()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+    }
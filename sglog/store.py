@@ -0,0 +1,551 @@
+"""Durable local round store.
+
+Rounds are kept in an embedded SQLite database in WAL mode so a half-entered
+round survives a browser refresh or a server restart. The app writes one
+hole's shots at a time as they are saved, and can reopen any round in a
+single read.
+
+The same database doubles as the season store: rounds are indexed by
+player, date, tournament and round type, so queries across many rounds are
+answered from the indexes rather than by scanning exported CSVs; per-round
+strokes-gained rollups and dispersion histograms are kept alongside. It also
+keeps a course library (par, yardage and pin per hole for each set of tees)
+that fills Step 2 in one go.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+
+DEFAULT_DB_PATH = os.environ.get("SGLOG_DB", "strokes_gained.db")
+
+# Shot dict key -> shots table column
+SHOT_COLUMNS = {
+    "Club": "club",
+    "Lie": "lie",
+    "PinDistance": "pin_distance",
+    "MissDirection": "miss_direction",
+    "PinHigh": "pin_high",
+    "OnLine": "on_line",
+    "FoulBall": "foul_ball",
+    "PuttBreak": "putt_break",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player TEXT NOT NULL,
+    round_date TEXT,
+    tournament TEXT,
+    round_number INTEGER,
+    round_type TEXT,
+    num_holes INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'in_progress',
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS holes (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    hole INTEGER NOT NULL,
+    par INTEGER,
+    score INTEGER,
+    yardage INTEGER,
+    pin TEXT,
+    saved INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (round_id, hole)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS shots (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    hole INTEGER NOT NULL,
+    stroke INTEGER NOT NULL,
+    club TEXT,
+    lie TEXT,
+    pin_distance INTEGER,
+    miss_direction TEXT,
+    pin_high,
+    on_line,
+    foul_ball TEXT,
+    putt_break TEXT,
+    PRIMARY KEY (round_id, hole, stroke)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sg_rollups (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    shots INTEGER NOT NULL,
+    strokes_gained REAL NOT NULL,
+    PRIMARY KEY (round_id, category, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS shot_histograms (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    histogram TEXT NOT NULL,
+    label TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    shots INTEGER NOT NULL,
+    PRIMARY KEY (round_id, histogram, label, bucket, outcome)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    tees TEXT NOT NULL DEFAULT '',
+    num_holes INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (name, tees)
+);
+
+CREATE TABLE IF NOT EXISTS course_holes (
+    course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    hole INTEGER NOT NULL,
+    par INTEGER,
+    yardage INTEGER,
+    pin TEXT,
+    PRIMARY KEY (course_id, hole)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_rounds_player_date ON rounds (player, round_date);
+CREATE INDEX IF NOT EXISTS idx_rounds_tournament ON rounds (tournament, round_number);
+CREATE INDEX IF NOT EXISTS idx_rounds_type_date ON rounds (round_type, round_date);
+CREATE INDEX IF NOT EXISTS idx_holes_par ON holes (par, round_id);
+"""
+
+# Stroke-trail column for each selected field of a shot query
+SHOT_QUERY_COLUMNS = {
+    'Player': "r.player",
+    'RndDate': "r.round_date",
+    'Tournament': "r.tournament",
+    'Round': "r.round_number",
+    'Round Type': "r.round_type",
+    'Hole': "h.hole",
+    'Par': "h.par",
+    'Stroke': "s.stroke",
+    'Club': "s.club",
+    'Lie': "s.lie",
+    'Pin Distance': "s.pin_distance",
+    'Pin Location': "h.pin",
+    'Miss Direction': "s.miss_direction",
+    'Pin-High': "s.pin_high",
+    'On-Line': "s.on_line",
+    'Putt Break': "s.putt_break",
+    'Foul Ball': "s.foul_ball",
+}
+
+
+# Grouping accepted by ``RoundStore.query_rollups`` -> SQL expression
+ROLLUP_GROUPS = {
+    "player": "r.player",
+    "season": "substr(r.round_date, 1, 4)",
+    "tournament": "r.tournament",
+    "round": "r.id",
+    "round_type": "r.round_type",
+    "bucket": "g.bucket",
+}
+
+
+def _now():
+    # Microseconds, so two saves in one second still get different values
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _round_filters(player=None, tournament=None, round_number=None, round_type=None,
+                   date_from=None, date_to=None, status=None, par=None, round_id=None,
+                   updated_since=None):
+    """SQL ``WHERE`` clause and parameters for round-level filters.
+
+    Every filter maps onto one of the ``rounds``/``holes`` indexes, except
+    ``updated_since`` (rounds saved at or after an ``updated_at``). ``par``
+    filters holes and so only applies to queries that join ``holes h``.
+    """
+    clauses = []
+    params = []
+    for column, value in (("r.id", round_id), ("r.player", player), ("r.tournament", tournament),
+                          ("r.round_number", round_number), ("r.round_type", round_type),
+                          ("r.status", status), ("h.par", par)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if date_from is not None:
+        clauses.append("r.round_date >= ?")
+        params.append(_iso(date_from))
+    if date_to is not None:
+        clauses.append("r.round_date <= ?")
+        params.append(_iso(date_to))
+    if updated_since is not None:
+        clauses.append("r.updated_at >= ?")
+        params.append(updated_since)
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+class RoundStore:
+    """SQLite-backed store of rounds, holes and shots.
+
+    One instance can be shared by every session of a server process; writes
+    are serialized with a lock and each call is its own transaction.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _insert_round(self, info, hole_table, status="in_progress"):
+        cur = self._conn.execute(
+            "INSERT INTO rounds (player, round_date, tournament, round_number, round_type,"
+            " num_holes, status, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (info.get("player_name", ""), _iso(info.get("round_date")),
+             info.get("tournament_name", ""), info.get("round_number"),
+             info.get("round_type", ""), len(hole_table["Hole"]), status, _now()),
+        )
+        round_id = cur.lastrowid
+        self._insert_holes(round_id, hole_table)
+        return round_id
+
+    def _insert_holes(self, round_id, hole_table):
+        self._conn.executemany(
+            "INSERT INTO holes (round_id, hole, par, score, yardage, pin) VALUES (?, ?, ?, ?, ?, ?)",
+            [(round_id, *row) for row in zip(hole_table["Hole"], hole_table["Par"],
+                                             hole_table["Score"], hole_table["Yardage"],
+                                             hole_table["Pin"])],
+        )
+
+    def _upsert_shots(self, round_id, hole, shots):
+        columns = list(SHOT_COLUMNS.values())
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns)
+        self._conn.executemany(
+            f"INSERT INTO shots (round_id, hole, stroke, {', '.join(columns)})"
+            f" VALUES ({placeholders})"
+            f" ON CONFLICT (round_id, hole, stroke) DO UPDATE SET {updates}",
+            [(round_id, hole, shot["ShotNumber"], *(shot.get(key) for key in SHOT_COLUMNS))
+             for shot in shots],
+        )
+        self._conn.execute(
+            "DELETE FROM shots WHERE round_id = ? AND hole = ? AND stroke > ?",
+            (round_id, hole, len(shots)),
+        )
+        self._conn.execute(
+            "UPDATE holes SET saved = 1 WHERE round_id = ? AND hole = ?", (round_id, hole)
+        )
+
+    def create_round(self, info, hole_table):
+        """Insert a round with its Step 1 ``info`` and Step 2 ``hole_table``.
+
+        ``info`` is keyed like ``st.session_state`` (``player_name``,
+        ``round_date``, ``tournament_name``, ``round_number``, ``round_type``).
+        Returns the new round id.
+        """
+        with self._lock, self._conn:
+            return self._insert_round(info, hole_table)
+
+    def replace_round(self, round_id, info, hole_table):
+        """Give round ``round_id`` new Step 1 ``info`` and Step 2 ``hole_table``.
+
+        Its shots, rollups and histograms are dropped and it is marked
+        ``in_progress``, as when Step 2 is submitted again. A round that no
+        longer exists is inserted instead. Returns the round id.
+        """
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE rounds SET player = ?, round_date = ?, tournament = ?, round_number = ?,"
+                " round_type = ?, num_holes = ?, status = 'in_progress', updated_at = ? WHERE id = ?",
+                (info.get("player_name", ""), _iso(info.get("round_date")),
+                 info.get("tournament_name", ""), info.get("round_number"),
+                 info.get("round_type", ""), len(hole_table["Hole"]), _now(), round_id),
+            )
+            if not cur.rowcount:
+                return self._insert_round(info, hole_table)
+            for table in ("holes", "shots", "sg_rollups", "shot_histograms"):
+                self._conn.execute(f"DELETE FROM {table} WHERE round_id = ?", (round_id,))
+            self._insert_holes(round_id, hole_table)
+        return round_id
+
+    def import_rounds(self, rounds, status="complete"):
+        """Bulk-insert rounds in one transaction, replacing stored copies.
+
+        ``rounds`` are dicts shaped like ``load_round`` results, e.g. from
+        ``stroke_trail.split_rounds``. A stored round with the same player,
+        date, tournament, round number and round type is replaced. Returns
+        the new ids, which are never those of a replaced round.
+        """
+        ids = []
+        with self._lock, self._conn:
+            for rnd in rounds:
+                info = rnd["info"]
+                self._conn.execute(
+                    "DELETE FROM rounds WHERE player = ? AND round_date IS ? AND tournament IS ?"
+                    " AND round_number IS ? AND round_type IS ?",
+                    (info.get("player_name", ""), _iso(info.get("round_date")),
+                     info.get("tournament_name", ""), info.get("round_number"),
+                     info.get("round_type", "")),
+                )
+                round_id = self._insert_round(info, rnd["hole_table"], status)
+                for hole, shots in rnd["shot_data"].items():
+                    self._upsert_shots(round_id, hole, shots)
+                ids.append(round_id)
+        return ids
+
+    def save_hole_shots(self, round_id, hole, shots):
+        """Upsert one hole's shot dicts and mark the hole saved.
+
+        Only the rows of ``hole`` are touched; strokes beyond ``len(shots)``
+        left over from an earlier save are removed.
+        """
+        with self._lock, self._conn:
+            self._upsert_shots(round_id, hole, shots)
+            self._conn.execute("UPDATE rounds SET updated_at = ? WHERE id = ?", (_now(), round_id))
+
+    def set_status(self, round_id, status):
+        """Mark a round ``in_progress`` or ``complete``."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE rounds SET status = ?, updated_at = ? WHERE id = ?", (status, _now(), round_id)
+            )
+
+    def save_rollups(self, rollups):
+        """Replace the strokes-gained rollups of rounds in one transaction.
+
+        ``rollups`` maps a round id to ``(category, bucket, shots,
+        strokes_gained)`` rows, e.g. from ``engine.category_rollup``.
+        """
+        with self._lock, self._conn:
+            for round_id, rows in rollups.items():
+                self._conn.execute("DELETE FROM sg_rollups WHERE round_id = ?", (round_id,))
+                self._conn.executemany(
+                    "INSERT INTO sg_rollups (round_id, category, bucket, shots, strokes_gained)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(round_id, category, bucket, int(shots), float(sg))
+                     for category, bucket, shots, sg in rows],
+                )
+
+    def query_rollups(self, by=("player",), **filters):
+        """Strokes gained per category, summed from the stored rollups.
+
+        ``by`` picks the grouping from ``ROLLUP_GROUPS`` (e.g. ``("player",
+        "season")``) and ``filters`` are the ``query_rounds`` filters. Rows
+        carry the ``by`` keys, ``category``, ``rounds``, ``shots`` and
+        ``strokes_gained``.
+        """
+        unknown = set(by) - set(ROLLUP_GROUPS)
+        if unknown:
+            raise ValueError(f"cannot group rollups by {', '.join(sorted(unknown))}")
+        where, params = _round_filters(**filters)
+        keys = [f"{ROLLUP_GROUPS[name]} AS {name}" for name in by]
+        group = ", ".join([*by, "category"])
+        sql = (
+            f"SELECT {', '.join([*keys, 'g.category AS category'])},"
+            " COUNT(DISTINCT g.round_id) AS rounds, SUM(g.shots) AS shots,"
+            " SUM(g.strokes_gained) AS strokes_gained"
+            f" FROM sg_rollups g JOIN rounds r ON r.id = g.round_id{where}"
+            f" GROUP BY {group} ORDER BY {group}"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def save_histograms(self, histograms):
+        """Replace the dispersion histograms of rounds in one transaction.
+
+        ``histograms`` maps a round id to ``(histogram, label, bucket,
+        outcome, shots)`` rows, e.g. from ``dispersion.shot_histograms``.
+        """
+        with self._lock, self._conn:
+            for round_id, rows in histograms.items():
+                self._conn.execute("DELETE FROM shot_histograms WHERE round_id = ?", (round_id,))
+                self._conn.executemany(
+                    "INSERT INTO shot_histograms (round_id, histogram, label, bucket, outcome, shots)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(round_id, histogram, label, bucket, outcome, int(shots))
+                     for histogram, label, bucket, outcome, shots in rows],
+                )
+
+    def query_histograms(self, histogram=None, by=(), **filters):
+        """Dispersion histogram counts summed over the matching rounds.
+
+        ``by`` adds groupings from ``ROLLUP_GROUPS`` (``bucket`` is already
+        included) and ``filters`` are the ``query_rounds`` filters. Rows carry
+        the ``by`` keys, ``histogram``, ``label``, ``bucket``, ``outcome`` and
+        ``shots``.
+        """
+        by = [name for name in by if name != "bucket"]
+        unknown = set(by) - set(ROLLUP_GROUPS)
+        if unknown:
+            raise ValueError(f"cannot group histograms by {', '.join(sorted(unknown))}")
+        where, params = _round_filters(**filters)
+        if histogram is not None:
+            where = f"{where} AND g.histogram = ?" if where else " WHERE g.histogram = ?"
+            params.append(histogram)
+        keys = [f"{ROLLUP_GROUPS[name]} AS {name}" for name in by]
+        group = ", ".join([*by, "histogram", "label", "bucket", "outcome"])
+        sql = (
+            f"SELECT {', '.join([*keys, 'g.histogram AS histogram', 'g.label AS label'])},"
+            " g.bucket AS bucket, g.outcome AS outcome, SUM(g.shots) AS shots"
+            f" FROM shot_histograms g JOIN rounds r ON r.id = g.round_id{where}"
+            f" GROUP BY {group} ORDER BY {group}"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def save_course(self, name, tees, hole_table):
+        """Store the par, yardage and pin of every hole of ``hole_table`` as a course.
+
+        A course with the same ``name`` and ``tees`` is replaced. Returns the
+        course id.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM courses WHERE name = ? AND tees = ?", (name, tees))
+            cur = self._conn.execute(
+                "INSERT INTO courses (name, tees, num_holes, updated_at) VALUES (?, ?, ?, ?)",
+                (name, tees, len(hole_table["Hole"]), _now()),
+            )
+            course_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO course_holes (course_id, hole, par, yardage, pin) VALUES (?, ?, ?, ?, ?)",
+                [(course_id, *row) for row in zip(hole_table["Hole"], hole_table["Par"],
+                                                  hole_table["Yardage"], hole_table["Pin"])],
+            )
+        return course_id
+
+    def list_courses(self):
+        """Course summaries (``id``, ``name``, ``tees``, ``num_holes``, ``updated_at``) by name and tees."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, tees, num_holes, updated_at FROM courses ORDER BY name, tees"
+            )
+            return [dict(row) for row in rows]
+
+    def load_course(self, course_id):
+        """A course as a Step 2 ``hole_table`` with no scores, or ``None``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM course_holes WHERE course_id = ? ORDER BY hole", (course_id,)
+            ).fetchall()
+        if not rows:
+            return None
+        return {
+            "Hole": [row["hole"] for row in rows],
+            "Par": [row["par"] for row in rows],
+            "Score": [None] * len(rows),
+            "Yardage": [row["yardage"] for row in rows],
+            "Pin": [row["pin"] for row in rows],
+        }
+
+    def list_rounds(self, status=None):
+        """Round summaries, most recently updated first."""
+        where, params = _round_filters(status=status)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT r.* FROM rounds r{where} ORDER BY r.updated_at DESC", params
+            )
+            return [dict(row) for row in rows]
+
+    def list_tournaments(self):
+        """Names of every tournament with a stored round, in order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT tournament FROM rounds WHERE tournament != '' ORDER BY tournament"
+            )
+            return [row["tournament"] for row in rows]
+
+    def query_rounds(self, **filters):
+        """Rounds matching ``player``, ``tournament``, ``round_number``,
+        ``round_type``, ``date_from``/``date_to`` and ``status`` filters, with
+        their total score and par, in date order.
+        """
+        where, params = _round_filters(**filters)
+        sql = (
+            "SELECT r.*, SUM(h.score) AS score, SUM(h.par) AS par FROM rounds r"
+            f" JOIN holes h ON h.round_id = r.id{where}"
+            " GROUP BY r.id ORDER BY r.round_date, r.id"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def query_shots(self, round_ids=False, **filters):
+        """Shots matching the ``query_rounds`` filters and optionally ``par``.
+
+        Rows are dicts keyed by the stroke-trail ``ALL_COLUMNS``, in play
+        order, ready for ``stroke_trail.rows_to_frame``. With ``round_ids``
+        they also carry the stored ``Round Id``.
+        """
+        where, params = _round_filters(**filters)
+        select = ", ".join(f'{expr} AS "{col}"' for col, expr in SHOT_QUERY_COLUMNS.items())
+        if round_ids:
+            select += ', r.id AS "Round Id"'
+        sql = (
+            f"SELECT {select} FROM rounds r"
+            " JOIN holes h ON h.round_id = r.id"
+            f" JOIN shots s ON s.round_id = h.round_id AND s.hole = h.hole{where}"
+            " ORDER BY r.round_date, r.id, h.hole, s.stroke"
+        )
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def load_round(self, round_id):
+        """Rebuild a round in the app's session-state shapes.
+
+        Returns a dict with ``info`` (Step 1 keys), ``hole_table``,
+        ``shot_data`` and ``saved_holes``, or ``None`` if there is no such
+        round.
+        """
+        with self._lock:
+            round_row = self._conn.execute("SELECT * FROM rounds WHERE id = ?", (round_id,)).fetchone()
+            if round_row is None:
+                return None
+            hole_rows = self._conn.execute(
+                "SELECT * FROM holes WHERE round_id = ? ORDER BY hole", (round_id,)
+            ).fetchall()
+            shot_rows = self._conn.execute(
+                "SELECT * FROM shots WHERE round_id = ? ORDER BY hole, stroke", (round_id,)
+            ).fetchall()
+
+        round_date = round_row["round_date"]
+        info = {
+            "player_name": round_row["player"],
+            "round_date": date.fromisoformat(round_date) if round_date else None,
+            "tournament_name": round_row["tournament"],
+            "round_number": round_row["round_number"],
+            "num_holes": round_row["num_holes"],
+            "round_type": round_row["round_type"],
+        }
+        hole_table = {
+            "Hole": [row["hole"] for row in hole_rows],
+            "Par": [row["par"] for row in hole_rows],
+            "Score": [row["score"] for row in hole_rows],
+            "Yardage": [row["yardage"] for row in hole_rows],
+            "Pin": [row["pin"] for row in hole_rows],
+        }
+
+        shot_data = {}
+        for row in shot_rows:
+            shot = {"ShotNumber": row["stroke"]}
+            for key, col in SHOT_COLUMNS.items():
+                if row[col] is not None:
+                    shot[key] = row[col]
+            shot_data.setdefault(row["hole"], []).append(shot)
+
+        return {
+            "info": info,
+            "hole_table": hole_table,
+            "shot_data": shot_data,
+            "saved_holes": {row["hole"] for row in hole_rows if row["saved"]},
+        }
@@ -0,0 +1,164 @@
+"""Reading and writing stroke-trail tables in the Step 4 CSV layout."""
+
+from datetime import date
+from itertools import groupby
+from operator import itemgetter
+
+import pandas as pd
+
+from sglog.core import ALL_COLUMNS, ROUND_COLUMNS, SHOT_FIELD_COLUMNS
+
+# Column dtypes used when loading a stroke-trail CSV
+COLUMN_DTYPES = {
+    'Player': "string",
+    'RndDate': "string",
+    'Tournament': "string",
+    'Round': "Int64",
+    'Round Type': "string",
+    'Hole': "Int64",
+    'Par': "Int64",
+    'Stroke': "Int64",
+    'Club': "string",
+    'Lie': "string",
+    'Pin Distance': "Float64",
+    'Pin Location': "string",
+    'Miss Direction': "string",
+    'Pin-High': "Int64",
+    'On-Line': "Int64",
+    'Putt Break': "string",
+    'Foul Ball': "string",
+}
+
+
+class StrokeTrailError(ValueError):
+    """Raised when a file is not in the stroke-trail CSV layout."""
+
+
+def rows_to_frame(rows):
+    """DataFrame in the ``ALL_COLUMNS`` layout from export row dicts."""
+    df = pd.DataFrame(rows)
+    for col in ALL_COLUMNS:
+        if col not in df.columns:
+            df[col] = pd.NA
+    return df[ALL_COLUMNS]
+
+
+def check_columns(columns, source="input"):
+    """Raise ``StrokeTrailError`` unless ``columns`` match ``ALL_COLUMNS``."""
+    columns = list(columns)
+    if columns != ALL_COLUMNS:
+        missing = [c for c in ALL_COLUMNS if c not in columns]
+        extra = [c for c in columns if c not in ALL_COLUMNS]
+        raise StrokeTrailError(
+            f"{source}: not a stroke-trail CSV (missing {missing}, unexpected {extra})"
+            if missing or extra else f"{source}: stroke-trail columns are out of order"
+        )
+
+
+def read_stroke_trail(path):
+    """Load a stroke-trail CSV, checking its columns and applying dtypes."""
+    df = pd.read_csv(path, dtype=COLUMN_DTYPES, keep_default_na=False, na_values=[""])
+    check_columns(df.columns, source=str(path))
+    return df
+
+
+def iter_round_tables(source, chunksize=50_000):
+    """Read a stroke-trail CSV in chunks and yield tables of whole rounds.
+
+    Rows of the round still being read when a chunk ends are carried into
+    the next one, so memory stays bounded by ``chunksize`` plus one round.
+    Each round's rows must be together in the file, as in Step 4 exports
+    and merged archives.
+    """
+    name = getattr(source, "name", str(source))
+    carry = None
+    reader = pd.read_csv(source, dtype=COLUMN_DTYPES, keep_default_na=False, na_values=[""],
+                         chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            check_columns(chunk.columns, source=name)
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            keys = chunk[ROUND_COLUMNS].astype("string").fillna("")
+            in_last_round = keys.eq(keys.iloc[-1]).all(axis=1).to_numpy()
+            # Hold back the trailing run of rows from the round still being read
+            tail = int(in_last_round[::-1].argmin()) if not in_last_round.all() else len(chunk)
+            split = len(chunk) - tail
+            if split:
+                yield chunk.iloc[:split].reset_index(drop=True)
+            carry = chunk.iloc[split:]
+    if carry is not None and len(carry):
+        yield carry.reset_index(drop=True)
+
+
+def write_table(df, path):
+    """Write a table as CSV without the index."""
+    df.to_csv(path, index=False)
+
+
+def _plain(val):
+    """Plain Python value from a table cell (400.0 -> 400)."""
+    val = val.item() if hasattr(val, "item") else val
+    if isinstance(val, float) and val.is_integer():
+        return int(val)
+    return val
+
+
+def split_rounds(df):
+    """Rebuild rounds from a stroke-trail table in the app's session shapes.
+
+    Yields one dict per round with ``info`` (Step 1 session keys),
+    ``hole_table``, ``shot_data`` and ``saved_holes``, the same shape as
+    ``RoundStore.load_round``. A hole's ``Score`` is its number of shots and
+    its ``Yardage`` is the tee shot's pin distance.
+    """
+    # One sort and one conversion for the whole table, then plain-Python
+    # grouping over consecutive records
+    ordered = df.sort_values(ROUND_COLUMNS + ['Hole', 'Stroke'], kind="stable")
+    ordered = ordered.astype(object).where(ordered.notna(), None)
+    records = ordered.to_dict("records")
+
+    for key, round_records in groupby(records, key=itemgetter(*ROUND_COLUMNS)):
+        player, rnd_date, tournament, rnd_number, round_type = map(_plain, key)
+        try:
+            rnd_date = date.fromisoformat(rnd_date)
+        except (TypeError, ValueError):
+            pass
+
+        hole_table = {"Hole": [], "Par": [], "Score": [], "Yardage": [], "Pin": []}
+        shot_data = {}
+        for hole, hole_records in groupby(round_records, key=itemgetter('Hole')):
+            hole = _plain(hole)
+            hole_records = list(hole_records)
+            shots = []
+            for record in hole_records:
+                if record['Stroke'] is None:
+                    continue
+                shot = {"ShotNumber": _plain(record['Stroke'])}
+                for col, field in SHOT_FIELD_COLUMNS.items():
+                    if record[col] is not None:
+                        shot[field] = _plain(record[col])
+                shots.append(shot)
+
+            tee_shot = shots[0] if shots and shots[0].get("Lie") == "Tee" else {}
+            hole_table["Hole"].append(hole)
+            hole_table["Par"].append(_plain(hole_records[0]['Par']))
+            hole_table["Score"].append(len(shots) or None)
+            hole_table["Yardage"].append(tee_shot.get("PinDistance"))
+            hole_table["Pin"].append(hole_records[0]['Pin Location'])
+            if shots:
+                shot_data[hole] = shots
+
+        yield {
+            "info": {
+                "player_name": player or "",
+                "round_date": rnd_date,
+                "tournament_name": tournament or "",
+                "round_number": rnd_number,
+                "num_holes": len(hole_table["Hole"]),
+                "round_type": round_type or "",
+            },
+            "hole_table": hole_table,
+            "shot_data": shot_data,
+            "saved_holes": set(shot_data),
+        }
@@ -0,0 +1,111 @@
+"""Vectorized shot-sequence validation.
+
+Checks stroke-trail tables, from one round up to a whole archive, for shot
+trails that cannot have happened. Every rule is one column operation over
+the table in play order, so a season is audited in one pass. Problems come
+back as a compact error index (row position, rule) that ``error_report``
+expands for display.
+
+Pin distances are compared in yards (green distances are in feet). A shot
+that moves away from the pin, or off the green after a putt, is only
+accepted when the previous shot recorded a miss direction.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sglog.engine import HOLE_KEY_COLUMNS
+
+# Rule code -> description, in the order of the error index categories
+RULES = {
+    "first_not_tee": "First shot of the hole is not from the Tee",
+    "missing_distance": "Pin Distance not entered",
+    "distance_up": "Pin Distance went up without a miss direction on the previous shot",
+    "left_green": "Shot after a putt is off the green without a miss direction on the putt",
+    "stroke_sequence": "Stroke numbers are not 1, 2, 3, ... within the hole",
+    "score_mismatch": "Number of shots differs from the hole's Score",
+    "tee_yardage": "Tee shot Pin Distance is far from the hole's Yardage",
+}
+
+# Largest accepted gap between the tee shot's pin distance and the hole's
+# yardage, as a fraction of the yardage (tees move and the pin distance is
+# measured straight rather than along the hole)
+YARDAGE_TOLERANCE = 0.15
+
+
+def validate_shots(df):
+    """Error index of ``df``: one row per problem with ``row`` and ``rule``.
+
+    ``row`` is the position of the offending shot in ``df`` and ``rule`` a
+    categorical of ``RULES`` codes. If ``df`` has a ``Score`` column, holes
+    whose shot count differs get one ``score_mismatch`` on their first shot;
+    if it has a ``Yardage`` column, tee shots more than ``YARDAGE_TOLERANCE``
+    away from it are flagged ``tee_yardage``.
+    Rows without a ``Stroke`` (holes exported without shots) are skipped.
+    """
+    stroke = pd.to_numeric(df["Stroke"], errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(stroke)
+    hole_id = df.groupby(HOLE_KEY_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+    order = np.lexsort((stroke, hole_id))
+    order = order[valid[order]]
+    n = len(order)
+
+    hole = hole_id[order]
+    stroke = stroke[order]
+    lie = df["Lie"].fillna("").to_numpy(dtype=object)[order]
+    miss = df["Miss Direction"].fillna("").to_numpy(dtype=object)[order]
+    distance = pd.to_numeric(df["Pin Distance"], errors="coerce").to_numpy(dtype=float)[order]
+    on_green = lie == "Green"
+    yards = np.where(on_green, distance / 3.0, distance)
+
+    first = np.ones(n, dtype=bool)
+    first[1:] = hole[1:] != hole[:-1]
+    has_prev = ~first
+    prev_yards = np.empty(n)
+    prev_yards[1:] = yards[:-1]
+    prev_missed = np.zeros(n, dtype=bool)
+    prev_missed[1:] = miss[:-1] != ""
+    prev_on_green = np.zeros(n, dtype=bool)
+    prev_on_green[1:] = on_green[:-1]
+
+    index = np.arange(n)
+    position = index - np.maximum.accumulate(np.where(first, index, 0)) + 1
+
+    checks = {
+        "first_not_tee": first & (lie != "Tee"),
+        "missing_distance": ~(distance >= 0),
+        "distance_up": has_prev & (prev_yards >= 0) & (yards > prev_yards) & ~prev_missed,
+        "left_green": has_prev & prev_on_green & ~on_green & ~prev_missed,
+        "stroke_sequence": stroke != position,
+    }
+    if "Score" in df:
+        shots_per_hole = np.bincount(hole, minlength=hole_id.max() + 1 if n else 0)
+        score = pd.to_numeric(df["Score"], errors="coerce").to_numpy(dtype=float)[order]
+        checks["score_mismatch"] = first & (shots_per_hole[hole] != score)
+    if "Yardage" in df:
+        yardage = pd.to_numeric(df["Yardage"], errors="coerce").to_numpy(dtype=float)[order]
+        with np.errstate(invalid="ignore"):
+            off = np.abs(distance - yardage) > YARDAGE_TOLERANCE * yardage
+        checks["tee_yardage"] = first & (lie == "Tee") & (distance >= 0) & off
+
+    rows = []
+    codes = []
+    for code, rule in enumerate(RULES):
+        if rule in checks:
+            hits = order[checks[rule]]
+            rows.append(hits)
+            codes.append(np.full(len(hits), code, dtype=np.int8))
+
+    errors = pd.DataFrame({
+        "row": np.concatenate(rows).astype(np.int32),
+        "rule": pd.Categorical.from_codes(np.concatenate(codes), categories=list(RULES)),
+    })
+    return errors.sort_values(["row", "rule"], kind="stable").reset_index(drop=True)
+
+
+def error_report(df, errors):
+    """Readable table of ``errors``: the shot's hole keys and stroke plus a description."""
+    report = df.iloc[errors["row"].to_numpy()][HOLE_KEY_COLUMNS + ["Stroke"]].reset_index(drop=True)
+    report["Rule"] = errors["rule"].to_numpy()
+    report["Problem"] = errors["rule"].map(RULES).astype(str).to_numpy()
+    return report
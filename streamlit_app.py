@@ -1,17 +1,209 @@
 import streamlit as st
-import pandas as pd
+
+from sglog.core import (
+    BINARY_OPTIONS, FOUL_BALL_OPTIONS, HOLE_LIMITS, LIE_OPTIONS, MISS_DIRECTIONS, PIN_DISTANCE_LIMITS,
+    PIN_LOCATIONS, PUTT_BREAKS, complete_hole_table, round_info,
+)
+from sglog.model import Hole, Round
+from sglog.profiling import RerunProfile, profile_logger, profiling_requested, timed
 
 # Wide layout for dashboards, data tables, or multi-column forms
 st.set_page_config(layout="wide", page_title="Strokes Gained Entry", page_icon="⛳")
 st.title("Golf Round Entry - Strokes Gained Logger")
 
+# Opt-in section timings (?profile=1 or SGLOG_PROFILE=1)
+profiling = profiling_requested(st.query_params)
+profile = RerunProfile(enabled=profiling, logger=profile_logger() if profiling else None)
+st.session_state.profile = profile  # Read by fragments when they rerun on their own
+
 # Session state to preserve inputs
 if "round_info_entered" not in st.session_state:
     st.session_state.round_info_entered = False
 if "hole_info_entered" not in st.session_state:
     st.session_state.hole_info_entered = False
 
+
+@st.cache_resource
+def get_round_store():
+    """Local round store shared by every session of this server process"""
+    from sglog.store import RoundStore
+
+    return RoundStore()
+
+
+def get_baseline(round_type):
+    """Expected-strokes table for a round type: the fitted SGLOG_BASELINE file if set, else tour"""
+    import os
+
+    from sglog.baseline import BASELINE_PATH, default_baseline, load_baseline
+    from sglog.cache import shared_cache
+
+    if not BASELINE_PATH:
+        return default_baseline()
+    # Keyed on the file's mtime so a refit is picked up without a restart
+    key = (BASELINE_PATH, round_type, os.stat(BASELINE_PATH).st_mtime_ns)
+    return shared_cache("baselines", max_entries=16).get_or_compute(
+        key, lambda: load_baseline(BASELINE_PATH, segment=round_type))
+
+
+def compact_session_state(keep_hole=None, num_holes=None):
+    """Drop widget keys whose values already live in hole_table / shot_data"""
+    from sglog.session import stale_widget_keys
+
+    for key in stale_widget_keys(list(st.session_state.keys()), keep_hole, num_holes):
+        del st.session_state[key]
+
+
+def resume_round(round_id):
+    """Load a stored round back into session state; ValueError if it is no longer stored"""
+    loaded = get_round_store().load_round(round_id)
+    if loaded is None:
+        raise ValueError("it is no longer stored")
+
+    # Drop widget values left over from whatever was on screen before
+    compact_session_state()
+
+    # Holes missing from the store get the Step 2 defaults
+    hole_table, _ = complete_hole_table(loaded["hole_table"])
+
+    for key, val in loaded["info"].items():
+        st.session_state[key] = val
+    st.session_state.round_id = round_id
+    st.session_state.round_info_entered = True
+    st.session_state.num_holes = len(hole_table["Hole"])
+    st.session_state.last_num_holes = len(hole_table["Hole"])
+    st.session_state.hole_page = 0
+    st.session_state.all_hole_data = hole_table
+    st.session_state.hole_table = hole_table
+    st.session_state.shot_data = {
+        hole: Hole.from_dicts(hole, hole_table["Par"][hole - 1], shots,
+                              score=hole_table["Score"][hole - 1],
+                              yardage=hole_table["Yardage"][hole - 1], pin=hole_table["Pin"][hole - 1])
+        for hole, shots in loaded["shot_data"].items()
+    }
+    st.session_state.saved_holes = loaded["saved_holes"]
+    st.session_state.hole_info_entered = True
+    st.session_state.pop("live_sg", None)
+
+    unsaved = [h for h in hole_table["Hole"] if h not in loaded["saved_holes"]]
+    st.session_state.selected_hole = unsaved[0] if unsaved else 1
+
+
+def import_stroke_trail(uploaded):
+    """Validate a stroke-trail CSV round by round and add its rounds to the round store"""
+    import pandas as pd
+
+    from sglog.engine import HOLE_KEY_COLUMNS
+    from sglog.model import scrub_shot
+    from sglog.stroke_trail import iter_round_tables, split_rounds
+    from sglog.validate import error_report, validate_shots
+
+    rounds = []
+    reports = []
+    unknown = []
+    filled = {}
+    for table in iter_round_tables(uploaded):
+        errors = validate_shots(table)
+        if len(errors):
+            reports.append(error_report(table, errors))
+        for rnd in split_rounds(table):
+            # Values the Step 3 widgets cannot show are fixed or dropped and reported
+            keys = {col: val for col, val in round_info(rnd["info"]).items() if col in HOLE_KEY_COLUMNS}
+            for hole, shots in rnd["shot_data"].items():
+                for shot in shots:
+                    for rule, problem in scrub_shot(shot):
+                        unknown.append({**keys, "Hole": hole, "Stroke": shot["ShotNumber"],
+                                        "Rule": rule, "Problem": problem})
+            rnd["hole_table"], filled_holes = complete_hole_table(rnd["hole_table"])
+            rnd["info"]["num_holes"] = len(rnd["hole_table"]["Hole"])
+            if filled_holes:
+                filled[len(rounds)] = filled_holes
+            rounds.append(rnd)
+
+    ids = get_round_store().import_rounds(rounds, status="in_progress")
+    if unknown:
+        reports.append(pd.DataFrame(unknown))
+    problems = pd.concat(reports, ignore_index=True) if reports else None
+    return ids, {ids[i]: holes for i, holes in filled.items()}, problems
+
+
+@st.fragment(run_every=15)
+def tournament_leaderboard():
+    """Leaderboard of a tournament's stored rounds, rescoring only rounds saved since the last refresh"""
+    from sglog.leaderboard import Leaderboard
+
+    store = get_round_store()
+    tournaments = store.list_tournaments()
+    if not tournaments:
+        st.info("No tournament rounds stored yet.")
+        return
+
+    current = st.session_state.get("tournament_name")
+    event_col, round_col = st.columns([3, 1])
+    tournament = event_col.selectbox("Tournament", tournaments,
+                                     index=tournaments.index(current) if current in tournaments else 0)
+    round_number = round_col.selectbox("Round", ["All", 1, 2, 3, 4])
+    round_number = None if round_number == "All" else round_number
+
+    board = st.session_state.get("leaderboard")
+    if board is None or (board.tournament, board.round_number) != (tournament, round_number):
+        board = st.session_state.leaderboard = Leaderboard(tournament, round_number, baseline=get_baseline)
+    updated = board.refresh_store(store)
+
+    st.dataframe(board.table().round(2), hide_index=True)
+    st.caption(f"Refreshes every 15 s; {updated} round(s) rescored this time.")
+
+
+# Resume a round that was autosaved before a refresh or restart
+profile.lap("Resume")
+in_progress = get_round_store().list_rounds(status="in_progress")
+if in_progress:
+    with st.expander("Resume an in-progress round"):
+        labels = {
+            r["id"]: f"{r['player']} – {r['tournament'] or 'No tournament'} – {r['round_date']} (Round {r['round_number']})"
+            for r in in_progress
+        }
+        resume_col, button_col = st.columns([4, 1])
+        resume_id = resume_col.selectbox("Saved rounds", list(labels), format_func=labels.get,
+                                         label_visibility="collapsed")
+        if button_col.button("Resume Round", use_container_width=True):
+            try:
+                resume_round(resume_id)
+            except ValueError as exc:
+                st.error(f"Could not resume this round: {exc}")
+            else:
+                st.rerun()
+
+# Load exported rounds back in to fix or finish them
+with st.expander("Import a stroke-trail CSV"):
+    uploaded = st.file_uploader("Stroke-trail CSV", type="csv", label_visibility="collapsed")
+    if uploaded is not None and st.button("Import and Open"):
+        try:
+            imported_ids, filled_holes, problems = import_stroke_trail(uploaded)
+        except ValueError as exc:
+            st.error(f"Could not import {uploaded.name}: {exc}")
+        else:
+            try:
+                if imported_ids:
+                    resume_round(imported_ids[0])
+            except ValueError as exc:
+                st.error(f"Could not open the imported round: {exc}")
+            st.success(f"Imported {len(imported_ids)} round(s) from {uploaded.name}; the first is open "
+                       "below and the rest are under \"Resume an in-progress round\".")
+            for round_id, holes in filled_holes.items():
+                st.warning(f"Round {round_id}: holes {', '.join(map(str, holes))} were incomplete "
+                           "or out of range in the file and got the Step 2 defaults or limits.")
+            if problems is not None:
+                st.warning(f"{len(problems)} possible data-entry problems in the file:")
+                st.dataframe(problems, hide_index=True)
+
+# Live leaderboard of every player's stored rounds in a tournament
+with st.expander("Tournament leaderboard"):
+    if st.toggle("Show live leaderboard"):
+        tournament_leaderboard()
+
 # Step 1: Round Info
+profile.lap("Step 1")
 st.header("Step 1: Round Info")
 with st.form("round_info_form"):
     # Create columns - adjust widths as needed
@@ -48,6 +240,7 @@ with st.form("round_info_form"):
 
     # Save values on submit
     if submitted:
+        previous = round_info(st.session_state)
         st.session_state.player_name = player_name
         st.session_state.round_date = rnd_date
         st.session_state.tournament_name = tournament
@@ -55,6 +248,9 @@ with st.form("round_info_form"):
         st.session_state.num_holes = num_holes
         st.session_state.round_type = round_type
         st.session_state.round_info_entered = True
+        # A different round gets its own row in the store on the next Step 2 submit
+        if round_info(st.session_state) != previous:
+            st.session_state.pop("round_id", None)
         st.success("Round info saved!")
 
 #Additional Notes (Green Speed, Weather, Wind, Temperature) + (Sunny OverCast Rain, High Medium Low, Slow Average Fast)
@@ -62,100 +258,104 @@ with st.form("round_info_form"):
 
 def show_scorecard_summary(hole_table):
     """Render the scorecard summary table"""
-    holes = hole_table["Hole"]
+    from sglog.scorecard import scorecard_html
 
     st.markdown("<h4 style='text-align: center; margin-top: 2rem;'>Scorecard Summary</h4>",
                 unsafe_allow_html=True)
+    st.markdown(scorecard_html(hole_table), unsafe_allow_html=True)
 
-    # Build HTML table
-    html = """
-    <style>
-        table.custom-table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 1rem;
-        }
-        table.custom-table th, table.custom-table td {
-            padding: 6px 10px;
-            text-align: center;
-            border: 1px solid #ccc;
-        }
-        .score-box {
-            display: inline-block;
-            width: 35px;
-            height: 35px;
-            line-height: 35px;
-            text-align: center;
-            font-weight: bold;
-        }
-    </style>
-    <table class='custom-table'>
-        <thead>
-            <tr>"""
-
-    for row in ["Hole", "Par", "Score"]:
-        html += f"<tr><th>{row}</th>"
-        for i in range(len(holes)):
-            if row == "Hole":
-                val = holes[i]
-                html += f"<td>{val}</td>"
-            elif row == "Par":
-                val = hole_table["Par"][i]
-                html += f"<td>{val}</td>"
-            elif row == "Score":
-                score = hole_table["Score"][i]
-                par = hole_table["Par"][i]
-
-                # Determine styling
-                if score <= par - 2:
-                    style = "border-radius: 50%; border: 4px double green; background-color: black;"
-                elif score == par - 1:
-                    style = "border-radius: 50%; border: 2px solid green; background-color: black;"
-                elif score == par:
-                    style = ""
-                elif score == par + 1:
-                    style = "border: 2px solid red; background-color: black;"
-                elif score >= par + 2:
-                    style = "border: 4px solid red; background-color: black;"
-
-                html += f"<td><div class='score-box' style='{style}'>{score}</div></td>"
-
-        html += "</tr>"
-
-    total_score = sum(hole_table["Score"])
-    total_par = sum(hole_table["Par"])
-    diff = total_score - total_par
-
-    if diff > 0:
-        diff_str = f"+{diff}"
-    elif diff < 0:
-        diff_str = f"{diff}"
-    else:
-        diff_str = "E"
 
-    total_score = sum(hole_table["Score"])
-    total_par = sum(hole_table["Par"])
-    diff = total_score - total_par
+def show_tournament_scorecards(player, tournament):
+    """Render one card with every stored round of the player's tournament"""
+    from sglog.scorecard import multi_round_html
+
+    store = get_round_store()
+    cards = []
+    for row in store.query_rounds(player=player, tournament=tournament):
+        loaded = store.load_round(row["id"])
+        cards.append((f"R{row['round_number']}", loaded["hole_table"]))
 
-    if diff > 0:
-        diff_str = f"+{diff}"
-    elif diff < 0:
-        diff_str = f"{diff}"
+    if cards:
+        st.markdown(multi_round_html(cards), unsafe_allow_html=True)
     else:
-        diff_str = "E"
-
-    html += f"""
-        <tr>
-            <th style='text-align: center; font-weight: bold;'>Total</th>
-             <td colspan='{len(holes)}' style='text-align: center; font-weight: bold;'>{total_score}</td>
-            <td style='text-align: center; font-weight: bold;'>{total_score} ({diff_str})</td>
-        </tr>
-    </tbody></table>
+        st.info("No stored rounds for this tournament yet.")
+
+
+def saved_round_results():
+    """Export frame and per-shot SG of the saved holes, memoized on the round's contents
+
+    Returns ``(cached, df, sg_df, baseline)``; ``cached(name, compute)`` memoizes
+    further results of the same contents in the process-wide round results cache.
     """
+    from sglog.cache import content_key, shared_cache
+    from sglog.engine import add_strokes_gained
+    from sglog.stroke_trail import rows_to_frame
 
-    st.markdown(html, unsafe_allow_html=True)
+    baseline = get_baseline(st.session_state.get("round_type"))
+    saved_holes = st.session_state.saved_holes
+    shot_data = st.session_state.shot_data
+    round_key = content_key(round_info(st.session_state), st.session_state.hole_table,
+                            {hole: shot_data[hole] for hole in sorted(saved_holes) if hole in shot_data},
+                            sorted(saved_holes), baseline.version)
+    results = shared_cache("round results", max_entries=64)
+
+    def cached(name, compute):
+        return results.get_or_compute((round_key, name), compute)
+
+    df = cached("frame", lambda: rows_to_frame(Round.from_session(st.session_state).export_rows(
+        st.session_state.hole_table, saved_holes)))  # Only saved holes
+    sg_df = cached("sg", lambda: add_strokes_gained(df, baseline))
+    return cached, df, sg_df, baseline
+
+
+def save_round_summaries(round_id, cached, df, sg_df):
+    """Replace a round's stored SG rollup and miss-pattern histograms"""
+    from sglog.dispersion import shot_histograms
+    from sglog.engine import category_rollup
+
+    store = get_round_store()
+    store.save_rollups({
+        round_id: cached("rollup", lambda: list(category_rollup(sg_df).itertuples(index=False, name=None)))
+    })
+    store.save_histograms({
+        round_id: cached("histograms", lambda: list(shot_histograms(df).itertuples(index=False, name=None)))
+    })
+
+
+def show_season_categories(player):
+    """Render the player's strokes gained per round by category and season"""
+    from sglog.engine import category_table
+
+    rows = get_round_store().query_rollups(by=("season",), player=player)
+    if rows:
+        st.dataframe(category_table(rows, ("season",)).round(2))
+    else:
+        st.info("No scored rounds yet - finish the round or generate the CSV to score it.")
+
+
+def show_season_dispersion(player):
+    """Render the player's miss patterns, pin-high/on-line and make rates from stored histograms"""
+    from sglog.dispersion import rate_table
+
+    rows = get_round_store().query_histograms(player=player)
+    if not rows:
+        st.info("No analysed rounds yet - finish the round or generate the CSV to add it.")
+        return
+
+    miss_tab, line_tab, putt_tab = st.tabs(["Miss direction", "Pin-high / On-line", "Putting"])
+    with miss_tab:
+        st.dataframe(rate_table(rows, "miss").round(1))
+    with line_tab:
+        pin_high = rate_table(rows, "pin_high")
+        on_line = rate_table(rows, "on_line")
+        st.dataframe(pin_high[["Yes"]].rename(columns={"Yes": "Pin-High %"})
+                     .join(on_line[["Yes"]].rename(columns={"Yes": "On-Line %"}), how="outer")
+                     .assign(Shots=pin_high["Shots"]).round(1))
+    with putt_tab:
+        st.dataframe(rate_table(rows, "putt").round(1))
 
 # Step 2: Hole Info
+profile.lap("Step 2")
 if st.session_state.round_info_entered:
     st.header("Step 2: Hole Info")
 
@@ -180,6 +380,7 @@ if st.session_state.round_info_entered:
     if "last_num_holes" not in st.session_state or st.session_state.last_num_holes != num_holes:
         st.session_state.last_num_holes = num_holes
         st.session_state.hole_page = 0
+        compact_session_state(num_holes=num_holes)
         st.session_state.all_hole_data = {
             "Hole": list(range(1, num_holes + 1)),
             "Par": [None] * num_holes,
@@ -191,6 +392,53 @@ if st.session_state.round_info_entered:
     if "hole_page" not in st.session_state:
         st.session_state.hole_page = 0
 
+    # Fill every hole from a saved course instead of entering it page by page
+    with st.expander("Course library"):
+        courses = get_round_store().list_courses()
+        course_col, load_col = st.columns([4, 1])
+        course = course_col.selectbox(
+            "Saved course", courses, index=None, placeholder="Choose a course" if courses else "No saved courses yet",
+            format_func=lambda c: f"{c['name']} ({c['tees']}) - {c['num_holes']} holes",
+            label_visibility="collapsed",
+        )
+        if load_col.button("Load Course", disabled=course is None, use_container_width=True):
+            from sglog.cache import shared_cache
+
+            # Keyed on updated_at so a course re-saved by another server process is reloaded
+            courses_cache = shared_cache("courses", max_entries=32)
+            course_key = (course["id"], course["updated_at"])
+            course_table = courses_cache.get(course_key)
+            if course_table is None:
+                course_table = get_round_store().load_course(course["id"])
+                if course_table is not None:  # Never cache a course deleted since the list was read
+                    courses_cache.put(course_key, course_table)
+            if course_table is None:
+                st.error("That course is no longer in the library.")
+            else:
+                course_table = {row: list(values) for row, values in course_table.items()}
+                # Scores start at par; only the holes that differ need changing
+                course_table["Score"] = list(course_table["Par"])
+                compact_session_state(num_holes=0)
+                st.session_state.num_holes = len(course_table["Hole"])
+                st.session_state.last_num_holes = len(course_table["Hole"])
+                st.session_state.hole_page = 0
+                st.session_state.all_hole_data = course_table
+                st.rerun()
+
+        name_col, tees_col, save_col = st.columns([3, 1, 1])
+        course_name = name_col.text_input("Course", placeholder="Course name")
+        course_tees = tees_col.text_input("Tees", placeholder="e.g. Blue")
+        save_col.markdown("<div style='margin-top: 1.75rem;'></div>", unsafe_allow_html=True)
+        if save_col.button("Save Course", disabled=not (course_name and "hole_table" in st.session_state),
+                           help="Saves the submitted hole info", use_container_width=True):
+            from sglog.cache import shared_cache
+
+            get_round_store().save_course(course_name.strip(), course_tees.strip(),
+                                          st.session_state.hole_table)
+            # Course ids are reused, so drop this process's copies at once
+            shared_cache("courses", max_entries=32).clear()
+            st.success(f"Saved {course_name} ({course_tees or 'no tees'}).")
+
     with st.form("hole_info_form"):
         st.markdown("<h3 style='text-align: center; margin-bottom: 1rem;'>Hole Summary Table</h3>",
                     unsafe_allow_html=True)
@@ -234,24 +482,27 @@ if st.session_state.round_info_entered:
                         unsafe_allow_html=True)
                     table_data[row].append(hole_number)
                 elif row == "Par":
-                    val = cols[i + 1].number_input("Par", min_value=3, max_value=5,
+                    val = cols[i + 1].number_input("Par", min_value=HOLE_LIMITS["Par"][0],
+                                                   max_value=HOLE_LIMITS["Par"][1],
                                                    value=st.session_state.all_hole_data[row][idx] or 4,
                                                    key=key, label_visibility="collapsed")
                     table_data[row].append(val)
                 elif row == "Score":
-                    val = cols[i + 1].number_input("Score", min_value=1, max_value=10,
+                    val = cols[i + 1].number_input("Score", min_value=HOLE_LIMITS["Score"][0],
+                                                   max_value=HOLE_LIMITS["Score"][1],
                                                    value=st.session_state.all_hole_data[row][idx] or 4,
                                                    key=key, label_visibility="collapsed")
                     table_data[row].append(val)
                 elif row == "Yardage":
-                    val = cols[i + 1].number_input("Yardage", min_value=50, max_value=800,
+                    val = cols[i + 1].number_input("Yardage", min_value=HOLE_LIMITS["Yardage"][0],
+                                                   max_value=HOLE_LIMITS["Yardage"][1],
                                                    value=st.session_state.all_hole_data[row][idx] or 400,
                                                    key=key, label_visibility="collapsed")
                     table_data[row].append(val)
                 elif row == "Pin":
-                    val = cols[i + 1].selectbox("Pin", options=["C", "FL", "FR", "BL", "BR"],
+                    val = cols[i + 1].selectbox("Pin", options=PIN_LOCATIONS,
                                                 index=0 if st.session_state.all_hole_data[row][idx] is None
-                                                else ["C", "FL", "FR", "BL", "BR"].index(st.session_state.all_hole_data[row][idx]),
+                                                else PIN_LOCATIONS.index(st.session_state.all_hole_data[row][idx]),
                                                 key=key, label_visibility="collapsed")
                     table_data[row].append(val)
 
@@ -303,13 +554,20 @@ if st.session_state.round_info_entered:
                 st.session_state.hole_info_entered = True
                 st.session_state.hole_table = st.session_state.all_hole_data
 
-                for k in ["shot_data", "saved_holes", "save_shots_clicked"]:
+                for k in ["shot_data", "saved_holes", "save_shots_clicked", "live_sg"]:
                     if k in st.session_state:
                         del st.session_state[k]
 
                 st.session_state.shot_data = {}
                 st.session_state.saved_holes = set()
                 st.session_state.selected_hole = 1
+                # Submitting again starts this round over rather than adding another one
+                if "round_id" in st.session_state:
+                    st.session_state.round_id = get_round_store().replace_round(
+                        st.session_state.round_id, st.session_state, st.session_state.hole_table)
+                else:
+                    st.session_state.round_id = get_round_store().create_round(
+                        st.session_state, st.session_state.hole_table)
 
                 st.success("All hole information saved and shot data reset!")
 
@@ -318,48 +576,74 @@ if st.session_state.round_info_entered:
                 st.warning(f"Please complete all {num_holes} holes before submitting")
 
 # Step 3: Shot Info
+profile.lap("Step 3")
 if st.session_state.get("hole_info_entered", False):
     st.header("Step 3: Shot Info")
 
     if "saved_holes" not in st.session_state:
         st.session_state.saved_holes = set()
 
+    def hole_from_grid(hole_num):
+        """Build a hole from its grid editor, applying the conditional-field rules"""
+        from sglog import grid
+
+        table = st.session_state.hole_table
+        idx = hole_num - 1
+        frame = grid.hole_frame(st.session_state.shot_data.get(hole_num), table["Score"][idx],
+                                table["Yardage"][idx])
+        frame = grid.apply_edits(frame, st.session_state.get(f"grid_{hole_num}"))
+        frame = grid.apply_conditional_fields(frame, table["Par"][idx])
+        return grid.frame_to_hole(frame, hole_num, table["Par"][idx], table["Score"][idx],
+                                  yardage=table["Yardage"][idx], pin=table["Pin"][idx])
+
+    def live_round_sg():
+        """Running strokes gained of the round in session state, rebuilt if missing"""
+        if "live_sg" not in st.session_state:
+            from sglog.live import LiveRoundSG
+
+            live = LiveRoundSG(get_baseline(st.session_state.get("round_type")))
+            for number, hole in st.session_state.shot_data.items():
+                live.set_hole(number, hole)
+            st.session_state.live_sg = live
+        return st.session_state.live_sg
+
+    def save_hole_shots(hole_num, mode=None):
+        """Read a hole's shot inputs into session state and autosave them to the round store"""
+        if (mode or st.session_state.get("entry_mode", "Form")) == "Grid":
+            hole = hole_from_grid(hole_num)
+        else:
+            table = st.session_state.hole_table
+            idx = hole_num - 1
+            hole = Hole.from_state(st.session_state, hole_num, table["Par"][idx], table["Score"][idx],
+                                   yardage=table["Yardage"][idx], pin=table["Pin"][idx])
+        saved_holes = st.session_state.saved_holes
+        completes_round = hole_num not in saved_holes and \
+            len(saved_holes) + 1 == len(st.session_state.hole_table["Hole"])
+        st.session_state.shot_data[hole_num] = hole
+        saved_holes.add(hole_num)
+        live_round_sg().update_hole(hole_num, hole)
+        if "round_id" in st.session_state:
+            get_round_store().save_hole_shots(st.session_state.round_id, hole_num, hole.as_dicts())
+            if completes_round:
+                # The season dashboards get a finished round without waiting for
+                # the export; later edits are summarized again by Generate CSV
+                save_round_summaries(st.session_state.round_id, *saved_round_results()[:3])
+
     # --- Handle Save Shots if button was clicked ---
     if "save_shots_clicked" in st.session_state and st.session_state.save_shots_clicked:
-        selected_hole = st.session_state.get("selected_hole", 1)
-        score = st.session_state.hole_table["Score"][selected_hole - 1]
-
-        shot_inputs = []
-        for shot in range(1, score + 1):
-            shot_dict = {
-                "ShotNumber": shot,
-                "Club": st.session_state.get(f"club_{selected_hole}_{shot}", ""),
-                "Lie": st.session_state.get(f"lie_{selected_hole}_{shot}", ""),
-                "PinDistance": st.session_state.get(f"pd_{selected_hole}_{shot}", ""),
-                "MissDirection": st.session_state.get(f"md_{selected_hole}_{shot}", "")
-            }
-
-            lie = shot_dict["Lie"]
-            par = st.session_state.hole_table["Par"][selected_hole - 1]
-            if lie == "Tee":
-                if par == 3:
-                    shot_dict["PinHigh"] = st.session_state.get(f"ph_{selected_hole}_{shot}", "")
-                    shot_dict["OnLine"] = st.session_state.get(f"ol_{selected_hole}_{shot}", "")
-                else:
-                    shot_dict["FoulBall"] = st.session_state.get(f"fb_{selected_hole}_{shot}", "")
-            elif lie == "Green":
-                shot_dict["PuttBreak"] = st.session_state.get(f"pb_{selected_hole}_{shot}", "")
-            else:
-                shot_dict["PinHigh"] = st.session_state.get(f"ph_{selected_hole}_{shot}", "")
-                shot_dict["OnLine"] = st.session_state.get(f"ol_{selected_hole}_{shot}", "")
-
-            shot_inputs.append(shot_dict)
-
-        st.session_state.shot_data[selected_hole] = shot_inputs
-        st.session_state.saved_holes.add(selected_hole)
+        save_hole_shots(st.session_state.get("selected_hole", 1))
         del st.session_state.save_shots_clicked  # Reset the flag
         st.rerun()  # Force immediate rerun to update UI
 
+    def entry_mode_callback():
+        # Keep what was typed in the mode being left
+        previous = "Form" if st.session_state.entry_mode == "Grid" else "Grid"
+        save_hole_shots(st.session_state.get("selected_hole", 1), mode=previous)
+
+    st.radio("Entry mode", ["Form", "Grid"], key="entry_mode", horizontal=True,
+             on_change=entry_mode_callback,
+             help="Grid edits all shots of a hole in one table")
+
     # --- Hole selection logic with auto-save ---
     st.markdown("### Select a Hole")
 
@@ -367,220 +651,201 @@ if st.session_state.get("hole_info_entered", False):
     def select_hole_callback(hole_num):
         prev_hole = st.session_state.get("selected_hole")
         if prev_hole:
-            score = st.session_state.hole_table["Score"][prev_hole - 1]
-            shot_inputs = []
-            for shot in range(1, score + 1):
-                shot_dict = {
-                    "ShotNumber": shot,
-                    "Club": st.session_state.get(f"club_{prev_hole}_{shot}", ""),
-                    "Lie": st.session_state.get(f"lie_{prev_hole}_{shot}", ""),
-                    "PinDistance": st.session_state.get(f"pd_{prev_hole}_{shot}", ""),
-                    "MissDirection": st.session_state.get(f"md_{prev_hole}_{shot}", "")
-                }
-
-                lie = shot_dict["Lie"]
-                par = st.session_state.hole_table["Par"][prev_hole - 1]
-                if lie == "Tee":
-                    if par == 3:
-                        shot_dict["PinHigh"] = st.session_state.get(f"ph_{prev_hole}_{shot}", "")
-                        shot_dict["OnLine"] = st.session_state.get(f"ol_{prev_hole}_{shot}", "")
-                    else:
-                        shot_dict["FoulBall"] = st.session_state.get(f"fb_{prev_hole}_{shot}", "")
-                elif lie == "Green":
-                    shot_dict["PuttBreak"] = st.session_state.get(f"pb_{prev_hole}_{shot}", "")
-                else:
-                    shot_dict["PinHigh"] = st.session_state.get(f"ph_{prev_hole}_{shot}", "")
-                    shot_dict["OnLine"] = st.session_state.get(f"ol_{prev_hole}_{shot}", "")
-
-                shot_inputs.append(shot_dict)
-
-            st.session_state.shot_data[prev_hole] = shot_inputs
-            st.session_state.saved_holes.add(prev_hole)
+            save_hole_shots(prev_hole)
 
         st.session_state.selected_hole = hole_num
-
-    total_holes = len(st.session_state.hole_table["Hole"])
-    cols = st.columns(total_holes)
-
-    for i, col in enumerate(cols):
-        hole_num = i + 1
-        is_saved = hole_num in st.session_state.saved_holes
-
-        button_label = f"Hole {hole_num}"
-        status_text = "✓ Saved" if is_saved else "Not Saved"
-        status_bg = "#d4edda" if is_saved else "#f8d7da"
-        status_color = "#155724" if is_saved else "#721c24"
-
-        # Use a shared wrapper with fixed width and center alignment
-        wrapper_html = f"""
-        <div style="width: 100%; text-align: center;">
-            <div style="background-color: {status_bg}; color: {status_color};
-                        padding: 4px 0; border-radius: 5px;
-                        font-size: 12px; margin-bottom: 4px; max-width: 100%;">
-                {status_text}
+        compact_session_state(keep_hole=hole_num, num_holes=len(st.session_state.hole_table["Hole"]))
+
+    @st.fragment
+    @timed("Step 3 hole selector", lambda: st.session_state.profile)
+    def hole_selector():
+        """Hole buttons; picking a hole saves the previous one and redraws the shot panel"""
+        total_holes = len(st.session_state.hole_table["Hole"])
+        cols = st.columns(total_holes)
+
+        for i, col in enumerate(cols):
+            hole_num = i + 1
+            is_saved = hole_num in st.session_state.saved_holes
+
+            button_label = f"Hole {hole_num}"
+            status_text = "✓ Saved" if is_saved else "Not Saved"
+            status_bg = "#d4edda" if is_saved else "#f8d7da"
+            status_color = "#155724" if is_saved else "#721c24"
+
+            # Use a shared wrapper with fixed width and center alignment
+            wrapper_html = f"""
+            <div style="width: 100%; text-align: center;">
+                <div style="background-color: {status_bg}; color: {status_color};
+                            padding: 4px 0; border-radius: 5px;
+                            font-size: 12px; margin-bottom: 4px; max-width: 100%;">
+                    {status_text}
+                </div>
             </div>
-        </div>
-        """
-        col.markdown(wrapper_html, unsafe_allow_html=True)
-
-        # Button — maintain same alignment
-        with col:
-            col.button(button_label, key=f"select_hole_{hole_num}",
-                       on_click=select_hole_callback, args=(hole_num,))
+            """
+            col.markdown(wrapper_html, unsafe_allow_html=True)
+
+            # Button — maintain same alignment
+            with col:
+                if col.button(button_label, key=f"select_hole_{hole_num}",
+                              on_click=select_hole_callback, args=(hole_num,)):
+                    # The shot panel sits outside this fragment, so redraw the whole app
+                    st.rerun()
 
     # --- Show Shot Input UI ---
-    selected_hole = st.session_state.get("selected_hole", 1)
-    st.subheader(f"Shot Entry for Hole {selected_hole}")
-    par = st.session_state.hole_table['Par'][selected_hole - 1]
-    yardage = st.session_state.hole_table['Yardage'][selected_hole - 1]
-    score = st.session_state.hole_table['Score'][selected_hole - 1]
-    pin = st.session_state.hole_table['Pin'][selected_hole - 1]
-
-    # Determine shape and style
-    shape_style = ""
-    if score <= par - 2:
-        shape_style = "border-radius: 50%; border: 3px double green;"
-    elif score == par - 1:
-        shape_style = "border-radius: 50%; border: 2px solid green;"
-    elif score == par + 1:
-        shape_style = "border: 2px solid red;"
-    elif score >= par + 2:
-        shape_style = "border: 3px double red;"
-
-    # Build styled score box
-    if shape_style:
-        styled_score = f"""
-            <span style="
-                display: inline-block;
-                width: 35px;
-                height: 35px;
-                line-height: 32px;
-                text-align: center;
-                font-weight: bold;
-                {shape_style}
-            ">
-                {score}
-            </span>
-        """
-    else:
-        styled_score = f"<span style='font-weight: bold;'>{score}</span>"
-
-    # Show the styled header
-    st.markdown(
-        f"""
-        <h3 style="text-align: left;">
-            Par {par} – {yardage} yds – {styled_score} Strokes – Pin ({pin})
-        </h3>
-        """,
-        unsafe_allow_html=True
-    )
-
-    score = st.session_state.hole_table["Score"][selected_hole - 1]
-    yardage = st.session_state.hole_table["Yardage"][selected_hole - 1]
-    par = st.session_state.hole_table["Par"][selected_hole - 1]
-
-
-    # Load saved data if available
-    if selected_hole in st.session_state.shot_data:
-        saved_shots = st.session_state.shot_data[selected_hole]
-    else:
-        saved_shots = [{} for _ in range(score)]
-
-    for shot in range(1, score + 1):
-        st.markdown(f"#### Shot {shot}")
-        cols = st.columns(8)
-
-        # Get saved values or defaults
-        saved_shot = saved_shots[shot-1] if shot-1 < len(saved_shots) else {}
-
-        club = cols[0].text_input("Club",
-                                 value=saved_shot.get("Club", ""),
-                                 key=f"club_{selected_hole}_{shot}")
-        lie = cols[1].selectbox("Lie", ["Tee", "Fairway", "Rough", "Sand", "Green", "Other", ""],
-                               index=["Tee", "Fairway", "Rough", "Sand", "Green", "Other", ""].index(saved_shot.get("Lie", "Tee")),
-                               key=f"lie_{selected_hole}_{shot}")
-        pin_distance = cols[2].number_input(
-            "Pin Distance", min_value=-1, max_value=1000,
-            value=saved_shot.get("PinDistance", int(yardage) if shot == 1 else -1),
-            key=f"pd_{selected_hole}_{shot}"
-        )
-        miss_direction = cols[3].selectbox("Miss Direction", ["", "Left", "Right", "Short", "Long"],
-                                         index=["", "Left", "Right", "Short", "Long"].index(saved_shot.get("MissDirection", "")),
-                                         key=f"md_{selected_hole}_{shot}")
-
-        # Conditional fields
-        if lie == "Tee":
-            if par == 3:
-                cols[4].selectbox("Pin-High", ["", 1, 0],
-                                index=["", 1, 0].index(saved_shot.get("PinHigh", "")),
-                                key=f"ph_{selected_hole}_{shot}")
-                cols[5].selectbox("On-Line", ["", 1, 0],
-                                 index=["", 1, 0].index(saved_shot.get("OnLine", "")),
-                                 key=f"ol_{selected_hole}_{shot}")
-            else:
-                cols[4].selectbox("Foul Ball", ["No", "Yes"],
-                                index=["No", "Yes"].index(saved_shot.get("FoulBall", "No")),
-                                key=f"fb_{selected_hole}_{shot}")
-        elif lie == "Green":
-            cols[4].selectbox("Putt Break", ["Straight", "Uphill-L2R", "Uphill-R2L", "Downhill-L2R", "Downhill-R2L", "Tap-In"],
-                             index=["Straight", "Uphill-L2R", "Uphill-R2L", "Downhill-L2R", "Downhill-R2L", "Tap-In"].index(
-                                 saved_shot.get("PuttBreak", "Straight")),
-                             key=f"pb_{selected_hole}_{shot}")
+    @st.fragment
+    @timed("Step 3 shot entry", lambda: st.session_state.profile)
+    def shot_entry_panel():
+        """Shot widgets for the selected hole; edits rerun only this panel"""
+        selected_hole = st.session_state.get("selected_hole", 1)
+        st.subheader(f"Shot Entry for Hole {selected_hole}")
+        par = st.session_state.hole_table['Par'][selected_hole - 1]
+        yardage = st.session_state.hole_table['Yardage'][selected_hole - 1]
+        score = st.session_state.hole_table['Score'][selected_hole - 1]
+        pin = st.session_state.hole_table['Pin'][selected_hole - 1]
+
+        # Determine shape and style
+        shape_style = ""
+        if score <= par - 2:
+            shape_style = "border-radius: 50%; border: 3px double green;"
+        elif score == par - 1:
+            shape_style = "border-radius: 50%; border: 2px solid green;"
+        elif score == par + 1:
+            shape_style = "border: 2px solid red;"
+        elif score >= par + 2:
+            shape_style = "border: 3px double red;"
+
+        # Build styled score box
+        if shape_style:
+            styled_score = f"""
+                <span style="
+                    display: inline-block;
+                    width: 35px;
+                    height: 35px;
+                    line-height: 32px;
+                    text-align: center;
+                    font-weight: bold;
+                    {shape_style}
+                ">
+                    {score}
+                </span>
+            """
         else:
-            cols[4].selectbox("Pin-High", ["", 1, 0],
-                            index=["", 1, 0].index(saved_shot.get("PinHigh", "")),
-                            key=f"ph_{selected_hole}_{shot}")
-            cols[5].selectbox("On-Line", ["", 1, 0],
-                            index=["", 1, 0].index(saved_shot.get("OnLine", "")),
-                            key=f"ol_{selected_hole}_{shot}")
-
-    # Manual save button with auto-advance
-    if st.button("Save Shots & Next Hole", key=f"save_{selected_hole}"):
-        # Save current hole's data
-        shot_inputs = []
-        for shot in range(1, score + 1):
-            shot_dict = {
-                "ShotNumber": shot,
-                "Club": st.session_state.get(f"club_{selected_hole}_{shot}", ""),
-                "Lie": st.session_state.get(f"lie_{selected_hole}_{shot}", "Tee"),  # Default to "Tee"
-                "PinDistance": st.session_state.get(f"pd_{selected_hole}_{shot}", 0.0),
-                "MissDirection": st.session_state.get(f"md_{selected_hole}_{shot}", "")
-            }
+            styled_score = f"<span style='font-weight: bold;'>{score}</span>"
+
+        # Show the styled header
+        st.markdown(
+            f"""
+            <h3 style="text-align: left;">
+                Par {par} – {yardage} yds – {styled_score} Strokes – Pin ({pin})
+            </h3>
+            """,
+            unsafe_allow_html=True
+        )
 
-            # Handle conditional fields based on lie type
-            lie = shot_dict["Lie"]
-            par = st.session_state.hole_table["Par"][selected_hole - 1]
+        score = st.session_state.hole_table["Score"][selected_hole - 1]
+        yardage = st.session_state.hole_table["Yardage"][selected_hole - 1]
+        par = st.session_state.hole_table["Par"][selected_hole - 1]
 
-            if lie == "Tee":
-                if par == 3:
-                    shot_dict["PinHigh"] = st.session_state.get(f"ph_{selected_hole}_{shot}", "")
-                    shot_dict["OnLine"] = st.session_state.get(f"ol_{selected_hole}_{shot}", "")
-                else:
-                    shot_dict["FoulBall"] = st.session_state.get(f"fb_{selected_hole}_{shot}", "No")
-            elif lie == "Green":
-                shot_dict["PuttBreak"] = st.session_state.get(f"pb_{selected_hole}_{shot}", "Straight")
-            else:
-                shot_dict["PinHigh"] = st.session_state.get(f"ph_{selected_hole}_{shot}", "")
-                shot_dict["OnLine"] = st.session_state.get(f"ol_{selected_hole}_{shot}", "")
 
-            shot_inputs.append(shot_dict)
+        # Load saved data if available
+        saved_shots = st.session_state.shot_data.get(selected_hole, ())
 
-        # Update session state
-        st.session_state.shot_data[selected_hole] = shot_inputs
-        st.session_state.saved_holes.add(selected_hole)
+        if st.session_state.get("entry_mode", "Form") == "Grid":
+            from sglog import grid
 
-        # Auto-advance to next hole if available
-        next_hole = selected_hole + 1
-        if next_hole <= len(st.session_state.hole_table["Hole"]):
-            st.session_state.selected_hole = next_hole
-            st.success(f"Hole {selected_hole} saved. Moving to Hole {next_hole}")
+            column_config = {
+                col: st.column_config.SelectboxColumn(col, options=options)
+                for col, options in grid.GRID_OPTIONS.items()
+            }
+            column_config["Pin Distance"] = st.column_config.NumberColumn(
+                "Pin Distance", min_value=PIN_DISTANCE_LIMITS[0], max_value=PIN_DISTANCE_LIMITS[1], step=1)
+            st.data_editor(grid.hole_frame(saved_shots or None, score, yardage),
+                           key=f"grid_{selected_hole}", num_rows="fixed",
+                           column_config=column_config, use_container_width=True)
+            st.caption("Fields that don't apply to a shot's lie are cleared when the hole is saved.")
         else:
-            st.success(f"Hole {selected_hole} saved (last hole completed)")
+            for shot in range(1, score + 1):
+                st.markdown(f"#### Shot {shot}")
+                cols = st.columns(8)
+
+                # Get saved values or defaults
+                saved_shot = saved_shots[shot-1] if shot-1 < len(saved_shots) else {}
+
+                club = cols[0].text_input("Club",
+                                         value=saved_shot.get("Club", ""),
+                                         key=f"club_{selected_hole}_{shot}")
+                lie = cols[1].selectbox("Lie", LIE_OPTIONS,
+                                       index=LIE_OPTIONS.index(saved_shot.get("Lie", "Tee")),
+                                       key=f"lie_{selected_hole}_{shot}")
+                pin_distance = cols[2].number_input(
+                    "Pin Distance", min_value=PIN_DISTANCE_LIMITS[0], max_value=PIN_DISTANCE_LIMITS[1],
+                    value=saved_shot.get("PinDistance", int(yardage) if shot == 1 else -1),
+                    key=f"pd_{selected_hole}_{shot}"
+                )
+                miss_direction = cols[3].selectbox("Miss Direction", MISS_DIRECTIONS,
+                                                 index=MISS_DIRECTIONS.index(saved_shot.get("MissDirection", "")),
+                                                 key=f"md_{selected_hole}_{shot}")
+
+                # Conditional fields
+                if lie == "Tee":
+                    if par == 3:
+                        cols[4].selectbox("Pin-High", BINARY_OPTIONS,
+                                        index=BINARY_OPTIONS.index(saved_shot.get("PinHigh", "")),
+                                        key=f"ph_{selected_hole}_{shot}")
+                        cols[5].selectbox("On-Line", BINARY_OPTIONS,
+                                         index=BINARY_OPTIONS.index(saved_shot.get("OnLine", "")),
+                                         key=f"ol_{selected_hole}_{shot}")
+                    else:
+                        cols[4].selectbox("Foul Ball", FOUL_BALL_OPTIONS,
+                                        index=FOUL_BALL_OPTIONS.index(saved_shot.get("FoulBall", "No")),
+                                        key=f"fb_{selected_hole}_{shot}")
+                elif lie == "Green":
+                    cols[4].selectbox("Putt Break", PUTT_BREAKS,
+                                     index=PUTT_BREAKS.index(
+                                         saved_shot.get("PuttBreak", "Straight")),
+                                     key=f"pb_{selected_hole}_{shot}")
+                else:
+                    cols[4].selectbox("Pin-High", BINARY_OPTIONS,
+                                    index=BINARY_OPTIONS.index(saved_shot.get("PinHigh", "")),
+                                    key=f"ph_{selected_hole}_{shot}")
+                    cols[5].selectbox("On-Line", BINARY_OPTIONS,
+                                    index=BINARY_OPTIONS.index(saved_shot.get("OnLine", "")),
+                                    key=f"ol_{selected_hole}_{shot}")
+
+        # Live strokes gained as entered; only the edited shots are rescored
+        if st.session_state.get("entry_mode", "Form") == "Grid":
+            entered = hole_from_grid(selected_hole)
+        else:
+            entered = Hole.from_state(st.session_state, selected_hole, par, score)
+        live = live_round_sg()
+        live.update_hole(selected_hole, entered)
+        hole_sg_col, round_sg_col = st.columns(2)
+        hole_sg_col.metric(f"Hole {selected_hole} Strokes Gained", f"{live.hole_total(selected_hole):+.2f}")
+        round_sg_col.metric("Round Strokes Gained (live)", f"{live.total:+.2f}")
+
+        # Manual save button with auto-advance
+        if st.button("Save Shots & Next Hole", key=f"save_{selected_hole}"):
+            # Save current hole's data
+            save_hole_shots(selected_hole)
+
+            # Auto-advance to next hole if available
+            next_hole = selected_hole + 1
+            if next_hole <= len(st.session_state.hole_table["Hole"]):
+                st.session_state.selected_hole = next_hole
+                st.success(f"Hole {selected_hole} saved. Moving to Hole {next_hole}")
+            else:
+                st.success(f"Hole {selected_hole} saved (last hole completed)")
+
+            compact_session_state(keep_hole=st.session_state.selected_hole,
+                                  num_holes=len(st.session_state.hole_table["Hole"]))
+            st.rerun()
 
-        st.rerun()
+    hole_selector()
+    shot_entry_panel()
 
 
 # --- Final Export Section ---
+profile.lap("Step 4")
 if st.session_state.get("hole_info_entered", False):
     st.header("Step 4: Export Data")
 
@@ -588,66 +853,26 @@ if st.session_state.get("hole_info_entered", False):
     all_hole_numbers = set(st.session_state.hole_table["Hole"])
     unsaved_holes = all_hole_numbers - saved_holes
 
+    if st.toggle("Show tournament scorecards"):
+        show_tournament_scorecards(st.session_state.player_name, st.session_state.tournament_name)
+
+    if st.toggle("Show season strokes gained by category"):
+        show_season_categories(st.session_state.player_name)
+
+    if st.toggle("Show season miss patterns"):
+        show_season_dispersion(st.session_state.player_name)
+
     if st.button("Generate CSV"):
-        import pandas as pd
-
-        # Define all columns with desired names
-        all_columns = [
-            'Player', 'RndDate', 'Tournament', 'Round', 'Round Type',
-            'Hole', 'Par', 'Stroke', 'Club', 'Lie',
-            'Pin Distance', 'Pin Location', 'Miss Direction',
-            'Pin-High', 'On-Line', 'Putt Break', 'Foul Ball'
-        ]
-
-        # Prepare data
-        rows = []
-        for hole_num in sorted(saved_holes):  # Only process saved holes
-            base_data = {
-                'Player': st.session_state.get("player_name", ""),
-                'RndDate': st.session_state.get("round_date", ""),
-                'Tournament': st.session_state.get("tournament_name", ""),
-                'Round': st.session_state.get("round_number", ""),
-                'Round Type': st.session_state.get("round_type", ""),
-                'Hole': hole_num,
-                'Par': st.session_state.hole_table['Par'][hole_num - 1]
-            }
+        if not unsaved_holes and "round_id" in st.session_state:
+            get_round_store().set_status(st.session_state.round_id, "complete")
 
-            if hole_num in st.session_state.shot_data:
-                for shot in st.session_state.shot_data[hole_num]:
-                    row = base_data.copy()
-                    row.update({
-                        'Stroke': shot.get('ShotNumber', pd.NA),
-                        'Club': shot.get('Club', pd.NA),
-                        'Lie': shot.get('Lie', pd.NA),
-                        'Pin Distance': shot.get('PinDistance', pd.NA),
-                        'Pin Location': st.session_state.hole_table['Pin'][hole_num - 1],
-                        'Miss Direction': shot.get('MissDirection', pd.NA),
-                        'Pin-High': shot.get('PinHigh', pd.NA),
-                        'On-Line': shot.get('OnLine', pd.NA),
-                        'Putt Break': shot.get('PuttBreak', pd.NA),
-                        'Foul Ball': shot.get('FoulBall', pd.NA)
-                    })
-                    rows.append(row)
-            else:
-                # If no shots saved, still record hole info
-                row = base_data.copy()
-                row.update({
-                    'Stroke': pd.NA, 'Club': pd.NA, 'Lie': pd.NA, 'Pin Distance': pd.NA,
-                    'Pin Location': st.session_state.hole_table['Pin'][hole_num - 1],
-                    'Miss Direction': pd.NA, 'Pin-High': pd.NA, 'On-Line': pd.NA,
-                    'Putt Break': pd.NA, 'Foul Ball': pd.NA
-                })
-                rows.append(row)
-
-        # Create DataFrame and ensure all columns are present
-        df = pd.DataFrame(rows)
-        for col in all_columns:
-            if col not in df.columns:
-                df[col] = pd.NA
-        df = df[all_columns]
+        # Everything below depends only on the round's contents, so sessions
+        # showing the same round (or the same session clicking again) share it
+        with profile.section("Step 4 export frame"):
+            cached, df, sg_df, baseline = saved_round_results()
 
         # Convert to CSV
-        csv_data = df.to_csv(index=False)
+        csv_data = cached("csv", lambda: df.to_csv(index=False))
 
         # Generate dynamic filename
         file_name = f"{st.session_state.player_name.replace(' ', '_')}_Stroke_Trail.csv"
@@ -660,13 +885,77 @@ if st.session_state.get("hole_info_entered", False):
             mime="text/csv"
         )
 
-        # Show preview
+        # Typed columnar exports for analytics
+        from sglog import columnar
+
+        if columnar.is_available():
+            stem = file_name.rsplit(".", 1)[0]
+            parquet_col, arrow_col = st.columns(2)
+            parquet_col.download_button(
+                label="Download Parquet",
+                data=cached("parquet", lambda: columnar.to_parquet_bytes(df)),
+                file_name=f"{stem}.parquet",
+                mime="application/vnd.apache.parquet"
+            )
+            arrow_col.download_button(
+                label="Download Arrow",
+                data=cached("arrow", lambda: columnar.to_arrow_bytes(df)),
+                file_name=f"{stem}.arrow",
+                mime="application/vnd.apache.arrow.file"
+            )
+
+        # Flag impossible shot trails before they reach SG reports
+        def shot_problems():
+            from sglog.validate import error_report, validate_shots
+
+            table = st.session_state.hole_table
+            errors = validate_shots(df.assign(Score=df["Hole"].map(dict(zip(table["Hole"], table["Score"]))),
+                                              Yardage=df["Hole"].map(dict(zip(table["Hole"], table["Yardage"])))))
+            return error_report(df, errors)[["Hole", "Stroke", "Problem"]]
+
+        problems = cached("problems", shot_problems)
+        if len(problems):
+            st.warning(f"{len(problems)} possible data-entry problems in the saved shots:")
+            st.dataframe(problems, hide_index=True)
+
+        # Rounds resumed or imported without further edits are summarized here
+        if "round_id" in st.session_state:
+            save_round_summaries(st.session_state.round_id, cached, df, sg_df)
+
+        # Show preview with per-shot strokes gained
+        st.metric("Strokes Gained (Round)", f"{sg_df['Strokes Gained'].sum():+.2f}")
+        st.caption(f"Baseline: {baseline.version}")
         st.write("Data Preview:")
-        st.dataframe(df)
+        st.dataframe(sg_df)
 
         # Show warning if some holes were skipped
         if unsaved_holes:
             st.warning(f"Note: Shots for Holes {', '.join(map(str, sorted(unsaved_holes)))} were not saved and have been excluded.")
 
+profile.finish()
+if profile.enabled:
+    with st.expander("Profiling (this rerun)"):
+        profile_rows = ["| Section | ms | Widgets |", "|---|---:|---:|"]
+        profile_rows += [f"| {r['section']} | {r['ms']:.1f} | {r['widgets']} |" for r in profile.records]
+        st.markdown("\n".join(profile_rows))
+        st.caption(f"Run {profile.run_id}; every section is also logged to the profile log.")
+
+        from sglog.session import session_sizes
+
+        sizes = session_sizes(st.session_state)
+        profile.note("session", keys=len(sizes), bytes=sum(sizes.values()))
+        largest = ", ".join(f"{key} ({size / 1024:.1f} KB)" for key, size in list(sizes.items())[:5])
+        st.caption(f"Session state: {sum(sizes.values()) / 1024:.1f} KB in {len(sizes)} keys; "
+                   f"largest: {largest}")
+
+        from sglog.cache import cache_stats
+
+        caches = cache_stats()
+        profile.note("cache", **caches)
+        cache_rows = ["| Cache | Entries | KB | Hits | Misses | Evictions |", "|---|---:|---:|---:|---:|---:|"]
+        cache_rows += [f"| {name} | {c['entries']} | {c.get('bytes', 0) / 1024:.1f} | {c['hits']} | "
+                       f"{c['misses']} | {c.get('evictions', 0)} |" for name, c in caches.items()]
+        st.markdown("\n".join(cache_rows))
+
 #streamlit run StrokesGainedSheet.py
 